@@ -19,6 +19,22 @@ def get_storage_path():
     return Path(os.getenv("PACS_STORAGE_PATH", "/var/lib/pacs/storage"))
 
 
+def existing_files(storage_root, storage_paths):
+    """
+    Return those of the given relative storage paths that exist on disk.
+
+    Lists each containing directory once rather than stat-ing every file.
+    """
+    existing = set()
+    for directory in {os.path.dirname(storage_path) for storage_path in storage_paths}:
+        try:
+            with os.scandir(storage_root / directory) as entries:
+                existing.update(f"{directory}/{entry.name}" for entry in entries if entry.is_file())
+        except FileNotFoundError:
+            continue
+    return existing
+
+
 def verify_storage():
     """Verify stored DICOM instances."""
     db_path = get_db_path()
@@ -27,9 +43,11 @@ def verify_storage():
         print(f"Database not found: {db_path}")
         return False
 
-    conn = sqlite3.connect(db_path)
+    # Open read-only so the verifier never takes the write lock on a live PACS database
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
+    cursor.execute("PRAGMA query_only=1")
 
     # Get total count
     cursor.execute("SELECT COUNT(*) as count FROM stored_instances WHERE status = 'STORED'")
@@ -71,24 +89,24 @@ def verify_storage():
     print(f"Most recent instances (showing {len(instances)} of {total}):\n")
 
     storage_root = get_storage_path()
+    existing = existing_files(storage_root, [instance["storage_path"] for instance in instances])
 
+    # Build the listing and write it once, rather than a print() per line
+    lines = []
     for i, instance in enumerate(instances, 1):
-        print(f"{i}. SOP Instance UID: {instance['sop_instance_uid']}")
-        print(f"   Patient ID:       *******{instance['patient_id'][7:]}")
-        print(f"   Patient Name:     {instance['patient_name'] or 'N/A'}")
-        print(f"   Accession Number: {instance['accession_number'] or 'N/A'}")
-        print(f"   Source AET:       {instance['source_aet']}")
-        print(f"   File Size:        {instance['file_size']:,} bytes")
-        print(f"   Created:          {instance['created_at']}")
-
         # Verify file exists
-        file_path = storage_root / instance["storage_path"]
-        if file_path.exists():
-            print(f"   File:             {instance['storage_path']}")
-        else:
-            print(f"   File:             Missing: {instance['storage_path']}")
-
-        print()
+        missing = "" if instance["storage_path"] in existing else "Missing: "
+        lines.append(
+            f"{i}. SOP Instance UID: {instance['sop_instance_uid']}\n"
+            f"   Patient ID:       *******{instance['patient_id'][7:]}\n"
+            f"   Patient Name:     {instance['patient_name'] or 'N/A'}\n"
+            f"   Accession Number: {instance['accession_number'] or 'N/A'}\n"
+            f"   Source AET:       {instance['source_aet']}\n"
+            f"   File Size:        {instance['file_size']:,} bytes\n"
+            f"   Created:          {instance['created_at']}\n"
+            f"   File:             {missing}{instance['storage_path']}\n\n"
+        )
+    sys.stdout.write("".join(lines))
 
     # Summary statistics
     cursor.execute(
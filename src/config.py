@@ -5,11 +5,30 @@ reads is resolved here, so the services and the health check don't
 drift apart in how they interpret a missing variable.
 
 These are functions, not module-level constants, so values are resolved
-at call time - after the entry point's load_dotenv() has run.
+at call time - after the entry point's load_env_file() has run.
 """
 
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def load_env_file() -> None:
+    """Load .env into the environment.
+
+    Set LOAD_DOTENV=0 where variables are supplied directly, e.g. in
+    containers, to skip searching for and parsing the file at startup.
+    """
+    if os.getenv("LOAD_DOTENV", "1") != "1":
+        return
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
 
 def mwl_db_path() -> str:
     return os.getenv("MWL_DB_PATH", "/var/lib/pacs/worklist.db")
@@ -49,3 +68,18 @@ def log_level() -> str:
 
 def log_format() -> str:
     return os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+def sqlite_mmap_size() -> int:
+    """SQLite memory-mapped I/O size in bytes; 0 disables it, e.g. on 32-bit builds."""
+    value = os.getenv("SQLITE_MMAP_SIZE", str(DEFAULT_SQLITE_MMAP_SIZE))
+    try:
+        size = int(value)
+    except ValueError:
+        size = -1
+
+    if size < 0:
+        logger.warning("Invalid SQLITE_MMAP_SIZE %r, using %d", value, DEFAULT_SQLITE_MMAP_SIZE)
+        return DEFAULT_SQLITE_MMAP_SIZE
+
+    return size
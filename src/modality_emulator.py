@@ -4,7 +4,6 @@ import os
 import time
 
 import numpy as np
-from dotenv import load_dotenv
 from PIL import Image
 from pydicom.dataset import Dataset, FileMetaDataset
 from pydicom.uid import ExplicitVRLittleEndian, generate_uid
@@ -19,13 +18,9 @@ from environment import Environment
 from services.dicom import PENDING, PENDING_WARNING, SUCCESS
 from services.mwl import MWLStatus
 from services.storage import MWLStorage
+from telemetry import configure_logging
 
-load_dotenv()
-
-logging.basicConfig(
-    level=config.log_level(),
-    format=config.log_format(),
-)
+config.load_env_file()
 
 logger = logging.getLogger(__name__)
 
@@ -118,8 +113,10 @@ class DicomExample:
 
         ds.file_meta = file_meta
 
-        logger.debug(f"Generated DICOM for worklist item {self.dataset.AccessionNumber} - {self.laterality}{self.view}")
-        logger.debug(f"{ds}")
+        logger.debug(
+            "Generated DICOM for worklist item %s - %s%s", self.dataset.AccessionNumber, self.laterality, self.view
+        )
+        logger.debug("%s", ds)
 
         return ds
 
@@ -137,8 +134,8 @@ class ModalityEmulator:
         pacs_assoc = ae.associate(PACS_HOST, PACS_PORT, ae_title=PACS_AET)
 
         if mwl_assoc.is_established and pacs_assoc.is_established:
-            logger.info(f"Connected to MWL server {MWL_HOST}:{MWL_PORT} ({MWL_AET})")
-            logger.info(f"Connected to PACS server {PACS_HOST}:{PACS_PORT} ({PACS_AET})")
+            logger.info("Connected to MWL server %s:%s (%s)", MWL_HOST, MWL_PORT, MWL_AET)
+            logger.info("Connected to PACS server %s:%s (%s)", PACS_HOST, PACS_PORT, PACS_AET)
 
             logger.info("Querying MWL for scheduled items...")
             c_find_dataset = self.c_find_dataset(patient_name=patient_name)
@@ -150,7 +147,7 @@ class ModalityEmulator:
                     accession_number = getattr(ds, "AccessionNumber", "UNKNOWN")
 
                     if accession_number in self.processed_items:
-                        logger.info(f"Skipping already processed worklist item {accession_number}")
+                        logger.info("Skipping already processed worklist item %s", accession_number)
                         continue
 
                     self.processed_items.add(accession_number)
@@ -159,31 +156,41 @@ class ModalityEmulator:
                     for laterality in DICOM_LATERALITIES:
                         for view in DICOM_VIEWS:
                             logger.info(
-                                f"Processing worklist item {accession_number} - generating DICOM for {laterality}{view}"
+                                "Processing worklist item %s - generating DICOM for %s%s",
+                                accession_number,
+                                laterality,
+                                view,
                             )
                             dicom_example = DicomExample(ds, laterality, view, study_instance_uid, series_number)
                             dataset = dicom_example.data
 
                             if getattr(dataset, "SOPInstanceUID", None) is None:
                                 logger.error(
-                                    f"Skipping DICOM generation for {laterality}{view} of worklist item {accession_number}"
+                                    "Skipping DICOM generation for %s%s of worklist item %s",
+                                    laterality,
+                                    view,
+                                    accession_number,
                                 )
                                 continue
 
                             pacs_assoc.send_c_store(dataset)
                             logger.info(
-                                f"Sent DICOM for {laterality}{view} of worklist item {accession_number}. Series# {series_number}"
+                                "Sent DICOM for %s%s of worklist item %s. Series# %s",
+                                laterality,
+                                view,
+                                accession_number,
+                                series_number,
                             )
                             series_number += 1
 
                     time.sleep(1)  # Allow C-STORE operations to complete before updating status
 
                     self.mwl_storage.update_status(accession_number, MWLStatus.COMPLETED.value)
-                    logger.info(f"Completed processing for worklist item {accession_number}")
+                    logger.info("Completed processing for worklist item %s", accession_number)
                 elif status_code == SUCCESS:
                     logger.info("C-FIND query completed successfully")
                 else:
-                    logger.error(f"C-FIND query failed with status: 0x{status_code:04X}")
+                    logger.error("C-FIND query failed with status: 0x%04X", status_code)
 
         else:
             logger.error("Failed to make MWL and PACS associations")
@@ -207,6 +214,8 @@ class ModalityEmulator:
 
 
 def main():
+    configure_logging()
+
     if Environment().production:
         raise RuntimeError("Modality Emulator should not be run in production environment")
 
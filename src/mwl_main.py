@@ -2,13 +2,11 @@
 
 import logging
 
-from dotenv import load_dotenv
-
 import config
 from server import MWLServer
-from telemetry import configure_telemetry
+from telemetry import configure_logging, configure_telemetry
 
-load_dotenv()
+config.load_env_file()
 
 
 def main():
@@ -20,10 +18,7 @@ def main():
     MWL_PORT: Port to listen on (default: 4243)
     MWL_DB_PATH: Path to the SQLite database file (default: /var/lib/pacs/worklist.db)
     """
-    logging.basicConfig(
-        level=config.log_level(),
-        format=config.log_format(),
-    )
+    configure_logging()
 
     mwl_aet = config.mwl_aet()
     mwl_port = config.mwl_port()
@@ -2,13 +2,11 @@
 
 import logging
 
-from dotenv import load_dotenv
-
 import config
 from server import PACSServer
-from telemetry import configure_telemetry
+from telemetry import configure_logging, configure_telemetry
 
-load_dotenv()
+config.load_env_file()
 
 
 def main():
@@ -21,10 +19,7 @@ def main():
     PACS_STORAGE_PATH: Path to store incoming DICOM files (default: /var/lib/pacs/storage)
     PACS_DB_PATH: Path to the SQLite database file (default: /var/lib/pacs/pacs.db)
     """
-    logging.basicConfig(
-        level=config.log_level(),
-        format=config.log_format(),
-    )
+    configure_logging()
 
     pacs_aet = config.pacs_aet()
     pacs_port = config.pacs_port()
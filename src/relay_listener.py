@@ -15,7 +15,6 @@ import time
 import urllib.parse
 
 from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
-from dotenv import load_dotenv
 from pynetdicom import AE
 from pynetdicom.sop_class import (
     DigitalMammographyXRayImageStorageForPresentation,  # type: ignore
@@ -31,9 +30,9 @@ from services.health import collect_health
 from services.mwl.create_worklist_item import CreateWorklistItem
 from services.mwl.update_worklist_item_status import UpdateWorklistItemStatus
 from services.storage import MWLStorage
-from telemetry import configure_telemetry
+from telemetry import configure_logging, configure_telemetry
 
-load_dotenv()
+config.load_env_file()
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +40,8 @@ DB_PATH = config.mwl_db_path()
 AZURE_RELAY_SCOPE = "https://relay.azure.net/.default"
 SAS_TOKEN_EXPIRY_SECONDS = 3600
 RELAY_REFRESH_MARGIN_SECONDS = 300
+RELAY_ACCEPT_WORKERS = 8
+RELAY_ACCEPT_QUEUE_SIZE = 64
 
 
 class CredentialNotAvailableError(RuntimeError):
@@ -75,6 +76,11 @@ class RelayListener:
     def __init__(self, storage: MWLStorage):
         self.storage = storage
         self.relay_uri = RelayURI()
+        self.create_worklist_item = CreateWorklistItem(storage)
+        self.update_worklist_item_status = UpdateWorklistItemStatus(storage)
+        self._accepts: asyncio.Queue[str] = asyncio.Queue(maxsize=RELAY_ACCEPT_QUEUE_SIZE)
+        self._accept_workers: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     async def listen(self):
         """Listen for messages from Azure Relay."""
@@ -84,19 +90,24 @@ class RelayListener:
             self.relay_uri.hybrid_connection_name,
         )
 
-        while True:
-            connection_url, expires_on = self.relay_uri.connection_details()
-            refresh_at = max(expires_on - RELAY_REFRESH_MARGIN_SECONDS, int(time.time()))
-
-            try:
-                async with self._connect(connection_url) as websocket:
-                    logger.info("Connected - waiting for worklist actions...")
-                    await self._listen_on_connection(websocket, refresh_at)
-            except RelayTokenExpiredError:
-                logger.info("Refreshing Azure Relay connection before expiry.")
-                continue
+        try:
+            while True:
+                connection_url, expires_on = self.relay_uri.connection_details()
+                refresh_at = max(expires_on - RELAY_REFRESH_MARGIN_SECONDS, int(time.time()))
+
+                try:
+                    async with self._connect(connection_url) as websocket:
+                        logger.info("Connected - waiting for worklist actions...")
+                        await self._listen_on_connection(websocket, refresh_at)
+                except RelayTokenExpiredError:
+                    logger.info("Refreshing Azure Relay connection before expiry.")
+                    continue
+        finally:
+            await self._stop_accept_workers()
 
     async def _listen_on_connection(self, websocket, refresh_at: int):
+        self._start_accept_workers()
+
         while True:
             timeout = refresh_at - time.time()
             if timeout <= 0:
@@ -111,23 +122,67 @@ class RelayListener:
                 data = json.loads(message)
 
                 if "accept" in data:
-                    accept_url = data["accept"]["address"]
                     logger.info("Incoming connection...")
+                    await self._accepts.put(data["accept"]["address"])
+            except Exception:
+                logger.exception("Error processing relay message")
 
-                    async with connect(accept_url, compression=None) as client_ws:
-                        try:
-                            client_message = await asyncio.wait_for(
-                                client_ws.recv(),
-                                timeout=30,
-                            )
-                            payload = json.loads(client_message)
-                            response = self.process_action(payload)
-
-                            await client_ws.send(json.dumps(response))
-                        except asyncio.TimeoutError:
-                            logger.error("Timeout waiting for message")
+    def _start_accept_workers(self):
+        """
+        Start the workers that serve accepted connections.
+
+        Workers outlive any one control connection, so a token refresh does not
+        interrupt actions already in flight. The bounded queue applies
+        backpressure to the control connection when every worker is busy.
+        """
+        if not self._accept_workers:
+            self._loop = asyncio.get_running_loop()
+            self._accept_workers = [asyncio.create_task(self._accept_worker()) for _ in range(RELAY_ACCEPT_WORKERS)]
+
+    async def _stop_accept_workers(self):
+        """
+        Discard queued accepts, then cancel the workers and wait for them to exit.
+
+        Called when listening stops, whether on shutdown or before main()
+        reconnects, so each listen() starts with a fresh set of workers.
+        """
+        dropped = 0
+        while not self._accepts.empty():
+            self._accepts.get_nowait()
+            self._accepts.task_done()
+            dropped += 1
+        if dropped:
+            logger.warning("Dropped %d queued relay connection(s)", dropped)
+
+        workers, self._accept_workers = self._accept_workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _accept_worker(self):
+        while True:
+            accept_url = await self._accepts.get()
+            try:
+                await self._handle_accept(accept_url)
             except Exception:
                 logger.exception("Error processing relay message")
+            finally:
+                self._accepts.task_done()
+
+    async def _handle_accept(self, accept_url: str):
+        async with connect(accept_url, compression=None) as client_ws:
+            try:
+                client_message = await asyncio.wait_for(
+                    client_ws.recv(),
+                    timeout=30,
+                )
+                payload = json.loads(client_message)
+                # Actions write to SQLite, so keep them off the event loop
+                response = await asyncio.to_thread(self.process_action, payload)
+
+                await client_ws.send(json.dumps(response))
+            except asyncio.TimeoutError:
+                logger.error("Timeout waiting for message")
 
     def process_action(self, payload: dict):
         """Process incoming action payload."""
@@ -142,9 +197,9 @@ class RelayListener:
                 "health": collect_health(),
             }
         if action_name == "worklist.create_item":
-            return CreateWorklistItem(self.storage).call(payload)
+            return self.create_worklist_item.call(payload)
         if action_name == "worklist.create_test_item":
-            result = CreateWorklistItem(self.storage).call(payload)
+            result = self.create_worklist_item.call(payload)
 
             worklist_item = payload.get("parameters", {}).get("worklist_item", {})
             participant = worklist_item.get("participant", {})
@@ -161,7 +216,7 @@ class RelayListener:
 
             return result
         if action_name == "worklist.update_status":
-            return UpdateWorklistItemStatus(self.storage).call(payload)
+            return self.update_worklist_item_status.call(payload)
 
         logger.error("Unsupported action: %s", action_name)
         return {"status": "error", "message": f"Unsupported action: {action_name}"}
@@ -188,13 +243,12 @@ class RelayListener:
             except Exception:
                 logger.exception("Modality emulator processing failed")
 
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # Called outside an event loop (e.g. unit tests)
+        if self._loop is None:
+            # Called outside the listener's event loop (e.g. unit tests)
             _run_emulator()
         else:
-            loop.create_task(asyncio.to_thread(_run_emulator))
+            # Actions run in a worker thread, so hand the emulator back to the loop
+            asyncio.run_coroutine_threadsafe(asyncio.to_thread(_run_emulator), self._loop)
 
 
 class RelayURI:
@@ -213,6 +267,7 @@ class RelayURI:
         )
         self.shared_access_key = os.getenv("AZURE_RELAY_SHARED_ACCESS_KEY", "")
         self._env = Environment()
+        self._sas_token: tuple[str, int] | None = None
 
         if self._use_sas():
             self._credential = None
@@ -255,23 +310,28 @@ class RelayURI:
         self,
         expiry_seconds: int = SAS_TOKEN_EXPIRY_SECONDS,
     ) -> tuple[str, int]:
+        # Reconnects reuse the default-lifetime token until the listener would refresh it anyway;
+        # a caller asking for another lifetime always gets a fresh token
+        cacheable = expiry_seconds == SAS_TOKEN_EXPIRY_SECONDS
+        if cacheable and self._sas_token and time.time() < self._sas_token[1] - RELAY_REFRESH_MARGIN_SECONDS:
+            return self._sas_token
+
         uri = f"http://{self.relay_namespace}/{self.hybrid_connection_name}"
         encoded_uri = urllib.parse.quote_plus(uri)
         expiry = int(time.time() + expiry_seconds)
         string_to_sign = f"{encoded_uri}\n{expiry}".encode()
-        digest = hmac.new(
-            self.shared_access_key.encode(),
-            string_to_sign,
-            hashlib.sha256,
-        ).digest()
+        digest = hmac.digest(self.shared_access_key.encode(), string_to_sign, hashlib.sha256)
         signature = base64.b64encode(digest).decode("ascii")
 
-        return (
+        sas_token = (
             f"SharedAccessSignature sr={encoded_uri}"
             f"&sig={urllib.parse.quote_plus(signature)}"
             f"&se={expiry}&skn={self.key_name}",
             expiry,
         )
+        if cacheable:
+            self._sas_token = sas_token
+        return sas_token
 
 
 def verify_credentials():
@@ -297,19 +357,17 @@ def verify_credentials():
 
 
 async def main():
-    logging.basicConfig(
-        level=config.log_level(),
-        format=config.log_format(),
-    )
+    configure_logging()
     configure_telemetry(service_name="relay-listener")
 
     logger.info("Socket Listener Starting...")
     verify_credentials()
     storage = MWLStorage(db_path=DB_PATH)
+    listener = RelayListener(storage)
 
     while True:
         try:
-            await RelayListener(storage).listen()
+            await listener.listen()
         except KeyboardInterrupt:
             logger.warning("\nShutting down...")
             break
@@ -58,7 +58,7 @@ class PACSServer:
 
     def start(self):
         """Start the PACS server and listen for incoming connections."""
-        logger.info(f"Starting PACS server: {self.ae_title} on port {self.port}")
+        logger.info("Starting PACS server: %s on port %d", self.ae_title, self.port)
 
         transfer_syntaxes = [
             dicom_uid.JPEGLosslessSV1,  # Hologic preferred
@@ -69,6 +69,11 @@ class PACSServer:
             dicom_uid.JPEG2000Lossless,
         ]
         self.ae = AE(ae_title=self.ae_title)
+        # Accept PDUs of any size so large images arrive in fewer network reads
+        self.ae.maximum_pdu_size = 0
+        # Allow slow modalities longer to negotiate; keep the default network timeout
+        # so dead associations still release their threads
+        self.ae.acse_timeout = 60
         self.ae.add_supported_context(Verification)
         self.ae.add_supported_context(DigitalMammographyXRayImageStorageForPresentation, transfer_syntaxes)
         self.ae.add_supported_context(DigitalMammographyXRayImageStorageForProcessing, transfer_syntaxes)
@@ -78,9 +83,9 @@ class PACSServer:
             (evt.EVT_C_STORE, CStore(self.storage, mwl_storage=self.mwl_storage).call),
         ]
 
-        logger.info(f"PACS server listening on 0.0.0.0:{self.port}")
-        logger.info(f"Storage: {self.storage.storage_root}")
-        logger.info(f"Database: {self.storage.db_path}")
+        logger.info("PACS server listening on 0.0.0.0:%d", self.port)
+        logger.info("Storage: %s", self.storage.storage_root)
+        logger.info("Database: %s", self.storage.db_path)
 
         self.ae.start_server(("0.0.0.0", self.port), block=self.block, evt_handlers=handlers)  # type: ignore
 
@@ -90,6 +95,7 @@ class PACSServer:
             logger.info("Stopping PACS server")
             self.ae.shutdown()
         self.storage.close()
+        self.mwl_storage.close()
 
 
 class MWLServer:
@@ -119,9 +125,11 @@ class MWLServer:
 
     def start(self):
         """Start the MWL server."""
-        logger.info(f"Starting MWL server: {self.ae_title} on port {self.port}")
+        logger.info("Starting MWL server: %s on port %d", self.ae_title, self.port)
 
         self.ae = AE(ae_title=self.ae_title)
+        self.ae.maximum_pdu_size = 0
+        self.ae.acse_timeout = 60
         self.ae.add_supported_context(Verification)
         self.ae.add_supported_context(ModalityWorklistInformationFind)
         self.ae.add_supported_context(ModalityPerformedProcedureStep)
@@ -133,8 +141,8 @@ class MWLServer:
             (evt.EVT_N_SET, NSet(self.storage).call),
         ]
 
-        logger.info(f"MWL server listening on 0.0.0.0:{self.port}")
-        logger.info(f"Database: {self.storage.db_path}")
+        logger.info("MWL server listening on 0.0.0.0:%d", self.port)
+        logger.info("Database: %s", self.storage.db_path)
 
         self.ae.start_server(("0.0.0.0", self.port), block=self.block, evt_handlers=handlers)  # type: ignore
 
@@ -143,3 +151,4 @@ class MWLServer:
         if self.ae:
             logger.info("Stopping MWL server")
             self.ae.shutdown()
+        self.storage.close()
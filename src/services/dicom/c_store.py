@@ -54,7 +54,7 @@ class CStore:
                 self.validator.validate_dataset(ds)
                 self.validator.validate_pixel_data(ds)
             except DicomValidationError as e:
-                logger.error(f"DICOM validation failed: {e}")
+                logger.error("DICOM validation failed: %s", e)
                 self._notify_failure(accession_number, f"DICOM validation failed: {e}")
                 return FAILURE
 
@@ -66,7 +66,7 @@ class CStore:
             try:
                 self.validator.validate_bytes(dicom_bytes)
             except DicomValidationError as e:
-                logger.error(f"Serialized DICOM invalid: {e}")
+                logger.error("Serialized DICOM invalid: %s", e)
                 self._notify_failure(accession_number, f"Serialized DICOM invalid: {e}")
                 return FAILURE
 
@@ -85,7 +85,7 @@ class CStore:
 
         except InstanceExistsError:
             # Instance already exists
-            logger.warning(f"Instance already exists: {sop_instance_uid}")
+            logger.warning("Instance already exists: %s", sop_instance_uid)
             return SUCCESS
 
         except Exception as e:
@@ -96,8 +96,8 @@ class CStore:
         with BytesIO() as buffer:
             # enforce_file_format=True ensures the 128-byte preamble and 'DICM' prefix are written
             dcmwrite(buffer, ds, enforce_file_format=True)
-            buffer.seek(0)
-            return buffer.read()
+            # getvalue() hands over the buffer's bytes without copying them again
+            return buffer.getvalue()
 
     def _mark_in_progress(self, accession_number: str) -> None:
         if not self.mwl_storage or not accession_number:
@@ -105,7 +105,7 @@ class CStore:
         try:
             self.mwl_storage.update_status(accession_number, MWLStatus.IN_PROGRESS.value)
         except Exception as e:
-            logger.error(f"Failed to mark worklist item in progress: {e}", exc_info=True)
+            logger.error("Failed to mark worklist item in progress: %s", e, exc_info=True)
 
     def _notify_failure(self, accession_number: str, error: str) -> None:
         if not self.mwl_storage or not self.notifier:
@@ -114,7 +114,7 @@ class CStore:
         source_message_id = self.mwl_storage.get_source_message_id(accession_number)
         if not source_message_id:
             logger.warning(
-                f"Cannot report validation failure: no worklist item found for accession {accession_number!r}"
+                "Cannot report validation failure: no worklist item found for accession %r", accession_number
             )
             return
 
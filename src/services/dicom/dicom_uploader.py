@@ -7,26 +7,73 @@ Uploads DICOM files to the Manage Breast Screening HTTP API endpoint.
 import io
 import logging
 import os
+import threading
 from typing import Optional
 
 import requests
 from azure.identity import ManagedIdentityCredential
+from requests.adapters import HTTPAdapter, Retry
 
 import config
 from environment import Environment
 
 logger = logging.getLogger(__name__)
 
+# Gateway errors from the cloud API are usually transient, so retry them with backoff
+# before an upload counts as failed.
+RETRY_STATUS_CODES = (502, 503, 504)
+
 
 class DICOMUploader:
-    def __init__(self, api_endpoint: str | None = None, timeout: int = 30, verify_ssl: bool = True):
+    def __init__(
+        self,
+        api_endpoint: str | None = None,
+        timeout: int = 30,
+        verify_ssl: bool = True,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_size: int = 4,
+    ):
         self.api_endpoint = api_endpoint or config.cloud_api_endpoint()
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        # Match the number of upload workers so connections are not discarded when the pool is full
+        self.pool_size = pool_size
+        # Reuse connections across uploads instead of a new TLS handshake per file. UploadProcessor
+        # uploads from several threads and requests.Session is not documented as thread-safe, so
+        # each thread gets its own session (and connection pool) rather than sharing one.
+        self._local = threading.local()
+        self._sessions: list[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                max_retries=Retry(
+                    total=self.max_retries,
+                    backoff_factor=self.backoff_factor,
+                    status_forcelist=RETRY_STATUS_CODES,
+                    allowed_methods=frozenset({"PUT"}),
+                    raise_on_status=False,
+                ),
+                pool_connections=1,
+                pool_maxsize=self.pool_size,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
 
     def upload_dicom(self, sop_instance_uid: str, dicom_stream: io.BufferedReader, action_id: Optional[str]) -> bool:
         if not action_id:
-            logger.error(f"No action_id for {sop_instance_uid}, upload will be rejected by server")
+            logger.error("No action_id for %s, upload will be rejected by server", sop_instance_uid)
             return False
 
         files = {
@@ -34,9 +81,9 @@ class DICOMUploader:
         }
 
         try:
-            logger.info(f"Uploading {sop_instance_uid} to {self.api_endpoint}/{action_id}")
+            logger.info("Uploading %s to %s/%s", sop_instance_uid, self.api_endpoint, action_id)
 
-            response = requests.put(
+            response = self.session.put(
                 f"{self.api_endpoint}/{action_id}",
                 files=files,
                 timeout=self.timeout,
@@ -45,21 +92,28 @@ class DICOMUploader:
             )
 
             if response.status_code == 201:
-                logger.info(f"Successfully uploaded {sop_instance_uid} (status: {response.status_code})")
+                logger.info("Successfully uploaded %s (status: %d)", sop_instance_uid, response.status_code)
                 return True
             else:
                 logger.error(
-                    f"Upload failed for {sop_instance_uid}: status {response.status_code}, body: {response.text}"
+                    "Upload failed for %s: status %d, body: %s", sop_instance_uid, response.status_code, response.text
                 )
                 return False
 
         except requests.exceptions.Timeout:
-            logger.error(f"Upload timeout for {sop_instance_uid} after {self.timeout}s")
+            logger.error("Upload timeout for %s after %ss", sop_instance_uid, self.timeout)
             return False
         except requests.exceptions.RequestException as e:
-            logger.error(f"Upload error for {sop_instance_uid}: {e}", exc_info=True)
+            logger.error("Upload error for %s: %s", sop_instance_uid, e, exc_info=True)
             return False
 
+    def close(self):
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+            self._local = threading.local()
+
     @property
     def headers(self) -> dict:
         return {
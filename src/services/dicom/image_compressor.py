@@ -39,20 +39,25 @@ class ImageCompressor:
             logger.info("No pixel data found, skipping compression")
             return ds
 
+        # Nothing to gain from a decode and re-encode round trip
+        if ds.file_meta.TransferSyntaxUID == JPEG2000 and not self.resizer.needs_resize(ds):
+            logger.info("Already JPEG 2000 at thumbnail size, skipping compression")
+            return ds
+
         # Decompress if already compressed
         if ds.file_meta.TransferSyntaxUID not in UNCOMPRESSED_TRANSFER_SYNTAXES:
             try:
-                logger.info(f"Decompressing from {ds.file_meta.TransferSyntaxUID.name}")
+                logger.info("Decompressing from %s", ds.file_meta.TransferSyntaxUID.name)
                 ds.decompress()
             except Exception as e:
-                logger.error(f"Decompression failed: {e}", exc_info=True)
+                logger.error("Decompression failed: %s", e, exc_info=True)
                 logger.warning("Continuing with compressed dataset")
 
         try:
             ds = self.resizer.resize(ds)
-            logger.debug(f"Resized to {ds.Columns}×{ds.Rows}")
+            logger.debug("Resized to %s×%s", ds.Columns, ds.Rows)
         except Exception as e:
-            logger.error(f"Resizing failed: {e}", exc_info=True)
+            logger.error("Resizing failed: %s", e, exc_info=True)
             logger.warning("Continuing with original size")
 
         try:
@@ -60,14 +65,20 @@ class ImageCompressor:
                 ds, transfer_syntax_uid=JPEG2000, encoding_plugin="pylibjpeg", j2k_cr=[self.compression_ratio]
             )
             logger.info(
-                f"Compressed to {compressed_ds.file_meta.TransferSyntaxUID.name} "
-                f"({self.compression_ratio}:1, {compressed_ds.Columns}×{compressed_ds.Rows})"
+                "Compressed to %s (%d:1, %s×%s)",
+                compressed_ds.file_meta.TransferSyntaxUID.name,
+                self.compression_ratio,
+                compressed_ds.Columns,
+                compressed_ds.Rows,
             )
             return compressed_ds
 
         except Exception as e:
-            logger.error(f"Compression failed: {e}", exc_info=True)
+            logger.error("Compression failed: %s", e, exc_info=True)
             logger.warning(
-                f"Returning uncompressed dataset ({ds.Columns}×{ds.Rows}, ~{(ds.Columns * ds.Rows * 2) / 1024:.0f} KB)"
+                "Returning uncompressed dataset (%s×%s, ~%.0f KB)",
+                ds.Columns,
+                ds.Rows,
+                (ds.Columns * ds.Rows * 2) / 1024,
             )
             return ds
@@ -12,12 +12,19 @@ from pydicom import Dataset
 
 logger = logging.getLogger(__name__)
 
+# Box-reduce by whole factors down to 3x the target before Lanczos; output is near-identical and several times faster
+DEFAULT_RESIZE_REDUCING_GAP = 3.0
+
 
 class ImageResizer:
-    def __init__(self, thumbnail_size: int | None = None):
+    def __init__(self, thumbnail_size: int | None = None, reducing_gap: float | None = None):
         self.thumbnail_size = (
             thumbnail_size if thumbnail_size is not None else int(os.getenv("DICOM_THUMBNAIL_SIZE", "400"))
         )
+        if reducing_gap is None:
+            reducing_gap = float(os.getenv("DICOM_RESIZE_REDUCING_GAP", str(DEFAULT_RESIZE_REDUCING_GAP)))
+        # A gap of 0 turns the pre-reduction off and runs Lanczos over the full image
+        self.reducing_gap = reducing_gap or None
 
     def _calculate_thumbnail_dimensions(self, original_cols: int, original_rows: int) -> tuple[int, int]:
         aspect_ratio = original_cols / original_rows
@@ -29,67 +36,57 @@ class ImageResizer:
             new_cols = int(self.thumbnail_size * aspect_ratio)
         return new_cols, new_rows
 
-    def _to_pil_image(self, pixel_array: np.ndarray, bits_allocated: int) -> tuple[Image.Image, dict]:
-        normalization_info = {}
-
+    def _to_pil_image(self, pixel_array: np.ndarray, bits_allocated: int) -> Image.Image:
         if bits_allocated == 16:
-            pixel_min = pixel_array.min()
-            pixel_max = pixel_array.max()
-            normalization_info = {"pixel_min": pixel_min, "pixel_max": pixel_max}
-
-            if pixel_max > pixel_min:
-                pixel_array_8bit = ((pixel_array - pixel_min) / (pixel_max - pixel_min) * 255).astype(np.uint8)
-            else:
-                # Handle uniform images (all same value)
-                pixel_array_8bit = np.zeros_like(pixel_array, dtype=np.uint8)
-            img = Image.fromarray(pixel_array_8bit, mode="L")
-        else:
-            img = Image.fromarray(pixel_array, mode="L")
+            # Resample at full precision; Pillow's 32-bit integer mode supports Lanczos with a reducing gap
+            return Image.fromarray(pixel_array.astype(np.int32))
 
-        return img, normalization_info
+        return Image.fromarray(pixel_array, mode="L")
 
-    def _from_pil_image(self, img: Image.Image, bits_allocated: int, normalization_info: dict) -> np.ndarray:
-        resized_array = np.array(img)
+    def _from_pil_image(
+        self, img: Image.Image, dtype: np.dtype, bits_stored: int, pixel_representation: int
+    ) -> np.ndarray:
+        resized_array = np.asarray(img)
 
-        # For 16-bit images, scale back to 16-bit range
-        if bits_allocated == 16:
-            pixel_min = normalization_info.get("pixel_min", 0)
-            pixel_max = normalization_info.get("pixel_max", 0)
+        # Lanczos can overshoot at sharp edges, so clamp to the range BitsStored can hold;
+        # values beyond it wrap around when the thumbnail is encoded at that bit depth
+        if pixel_representation == 1:
+            low, high = -(2 ** (bits_stored - 1)), 2 ** (bits_stored - 1) - 1
+        else:
+            low, high = 0, 2**bits_stored - 1
 
-            if pixel_max > pixel_min:
-                resized_array = (resized_array.astype(np.float32) / 255 * (pixel_max - pixel_min) + pixel_min).astype(
-                    np.uint16
-                )
-            else:
-                # Keep uniform image as is
-                resized_array = resized_array.astype(np.uint16)
+        return np.clip(resized_array, low, high).astype(dtype, copy=False)
 
-        return resized_array
+    def needs_resize(self, ds: Dataset) -> bool:
+        return ds.Rows > self.thumbnail_size or ds.Columns > self.thumbnail_size
 
     def resize(self, ds: Dataset) -> Dataset:
         original_rows = ds.Rows
         original_cols = ds.Columns
 
         # Skip if already smaller than thumbnail size
-        if original_rows <= self.thumbnail_size and original_cols <= self.thumbnail_size:
+        if not self.needs_resize(ds):
             logger.info(
-                f"Image {original_cols}x{original_rows} already smaller than {self.thumbnail_size}, skipping resize"
+                "Image %sx%s already smaller than %s, skipping resize",
+                original_cols,
+                original_rows,
+                self.thumbnail_size,
             )
             return ds
 
         # Calculate new dimensions
         new_cols, new_rows = self._calculate_thumbnail_dimensions(original_cols, original_rows)
-        logger.info(f"Resizing from {original_cols}x{original_rows} to {new_cols}x{new_rows}")
+        logger.info("Resizing from %sx%s to %sx%s", original_cols, original_rows, new_cols, new_rows)
 
         # Convert DICOM to PIL Image
         pixel_array = ds.pixel_array
-        img, normalization_info = self._to_pil_image(pixel_array, ds.BitsAllocated)
+        img = self._to_pil_image(pixel_array, ds.BitsAllocated)
 
         # Resize
-        img_resized = img.resize((new_cols, new_rows), Image.Resampling.LANCZOS)
+        img_resized = img.resize((new_cols, new_rows), Image.Resampling.LANCZOS, reducing_gap=self.reducing_gap)
 
         # Convert back to DICOM pixel data
-        resized_array = self._from_pil_image(img_resized, ds.BitsAllocated, normalization_info)
+        resized_array = self._from_pil_image(img_resized, pixel_array.dtype, ds.BitsStored, ds.PixelRepresentation)
 
         # Update dataset
         ds.PixelData = resized_array.tobytes()
@@ -6,7 +6,7 @@ and uploads them to the Manage Breast Screening HTTP API endpoint.
 """
 
 import logging
-import time
+import threading
 
 from services.dicom.upload_processor import UploadProcessor
 
@@ -32,25 +32,32 @@ class UploadListener:
         self.poll_interval = poll_interval
         self.batch_size = batch_size
         self._running = False
+        self._wake = threading.Event()
 
     def start(self):
         logger.info("Upload listener started")
         self._running = True
+        self._wake.clear()
 
         while self._running:
             try:
-                self.processor.process_batch(limit=self.batch_size)
+                processed = self.processor.process_batch(limit=self.batch_size)
+
+                # A full batch means more uploads are likely waiting, so fetch the next batch straight away
+                if processed == self.batch_size and not self.processor.backoff_delay:
+                    continue
 
                 # Add backoff delay to poll interval when experiencing failures
                 sleep_time = self.poll_interval + self.processor.backoff_delay
-                time.sleep(sleep_time)
+                self._wake.wait(sleep_time)
 
             except Exception as e:
-                logger.error(f"Error in upload listener: {e}", exc_info=True)
-                time.sleep(self.poll_interval)
+                logger.error("Error in upload listener: %s", e, exc_info=True)
+                self._wake.wait(self.poll_interval)
 
         logger.info("Upload listener stopped")
 
     def stop(self):
         logger.info("Stopping upload listener...")
         self._running = False
+        self._wake.set()
@@ -6,6 +6,8 @@ including retry handling and status tracking.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from services.dicom.dicom_uploader import DICOMUploader
 from services.storage import MWLStorage, PACSStorage
@@ -23,6 +25,7 @@ class UploadProcessor:
         initial_backoff: float = 1.0,
         max_backoff: float = 60.0,
         backoff_multiplier: float = 2.0,
+        max_workers: int = 4,
     ):
         self.pacs_storage = pacs_storage
         self.mwl_storage = mwl_storage
@@ -32,6 +35,8 @@ class UploadProcessor:
         self._max_backoff = max_backoff
         self._backoff_multiplier = backoff_multiplier
         self._current_backoff = 0.0
+        # Uploads are bound by network round trips, so overlap them across a small pool
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dicom-upload")
 
     def process_batch(self, limit: int = 10) -> int:
         pending = self.pacs_storage.get_pending_uploads(limit=limit, max_retries=self.max_retries)
@@ -40,33 +45,37 @@ class UploadProcessor:
             self._reset_backoff()
             return 0
 
-        logger.info(f"Found {len(pending)} images pending upload")
+        logger.info("Found %d images pending upload", len(pending))
+        # Instances of one study share an accession number, so look the batch's action IDs up in one
+        # query. The mapping lives only as long as the batch and is read-only while workers use it.
+        source_message_ids = self._fetch_source_message_ids(pending)
+        upload = partial(self.upload_instance, source_message_ids=source_message_ids)
 
-        successes = 0
-        for instance in pending:
-            if self.upload_instance(instance):
-                successes += 1
+        successes = sum(self._executor.map(upload, pending))
 
         failures = len(pending) - successes
 
         if failures > 0:
             self._increase_backoff()
             logger.info(
-                f"Batch complete: {successes}/{len(pending)} succeeded, backoff now {self._current_backoff:.1f}s"
+                "Batch complete: %d/%d succeeded, backoff now %.1fs", successes, len(pending), self._current_backoff
             )
         else:
             self._reset_backoff()
-            logger.info(f"Batch complete: all {len(pending)} uploads succeeded")
+            logger.info("Batch complete: all %d uploads succeeded", len(pending))
 
         return len(pending)
 
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
     @property
     def backoff_delay(self) -> float:
         return self._current_backoff
 
     def _reset_backoff(self) -> None:
         if self._current_backoff > 0:
-            logger.debug(f"Resetting backoff from {self._current_backoff:.1f}s to 0")
+            logger.debug("Resetting backoff from %.1fs to 0", self._current_backoff)
         self._current_backoff = 0.0
 
     def _increase_backoff(self) -> None:
@@ -77,15 +86,15 @@ class UploadProcessor:
                 self._current_backoff * self._backoff_multiplier,
                 self._max_backoff,
             )
-        logger.debug(f"Increased backoff to {self._current_backoff:.1f}s")
+        logger.debug("Increased backoff to %.1fs", self._current_backoff)
 
-    def upload_instance(self, instance: dict) -> bool:
+    def upload_instance(self, instance: dict, source_message_ids: dict[str, str] | None = None) -> bool:
         sop_instance_uid = instance["sop_instance_uid"]
         storage_path = instance["storage_path"]
         accession_number = instance.get("accession_number")
         attempt_count = instance.get("upload_attempt_count", 0)
 
-        logger.info(f"Processing upload {sop_instance_uid} (attempt {attempt_count + 1}/{self.max_retries})")
+        logger.info("Processing upload %s (attempt %d/%d)", sop_instance_uid, attempt_count + 1, self.max_retries)
 
         try:
             self.pacs_storage.mark_upload_started(sop_instance_uid)
@@ -97,11 +106,14 @@ class UploadProcessor:
                 self._mark_failed(sop_instance_uid, error, attempt_count + 1)
                 return False
 
-            action_id = self.mwl_storage.get_source_message_id(accession_number) if accession_number else None
+            action_id = self._source_message_id(accession_number, source_message_ids) if accession_number else None
+
+            with open(dicom_path, "rb") as dicom_stream:
+                uploaded = self.uploader.upload_dicom(sop_instance_uid, dicom_stream, action_id)
 
-            if self.uploader.upload_dicom(sop_instance_uid, open(dicom_path, "rb"), action_id):
+            if uploaded:
                 self.pacs_storage.mark_upload_complete(sop_instance_uid)
-                logger.info(f"Successfully uploaded {sop_instance_uid}")
+                logger.info("Successfully uploaded %s", sop_instance_uid)
                 return True
             else:
                 error = "Upload returned failure status"
@@ -110,17 +122,31 @@ class UploadProcessor:
 
         except Exception as e:
             error = f"Unexpected error: {str(e)}"
-            logger.error(f"Error uploading {sop_instance_uid}: {e}", exc_info=True)
+            logger.error("Error uploading %s: %s", sop_instance_uid, e, exc_info=True)
             self._mark_failed(sop_instance_uid, error, attempt_count + 1)
             return False
 
+    def _fetch_source_message_ids(self, pending: list[dict]) -> dict[str, str]:
+        accession_numbers = [instance["accession_number"] for instance in pending if instance.get("accession_number")]
+        if not accession_numbers:
+            return {}
+        return self.mwl_storage.get_source_message_ids(accession_numbers)
+
+    def _source_message_id(self, accession_number: str, source_message_ids: dict[str, str] | None) -> str | None:
+        if source_message_ids and accession_number in source_message_ids:
+            return source_message_ids[accession_number]
+        # Not prefetched, or the worklist item had not arrived when the batch started
+        return self.mwl_storage.get_source_message_id(accession_number)
+
     def _mark_failed(self, sop_instance_uid: str, error: str, attempt_count: int) -> None:
         permanent = attempt_count >= self.max_retries
         self.pacs_storage.mark_upload_failed(sop_instance_uid, error, permanent=permanent)
 
         if permanent:
-            logger.error(f"Upload permanently failed for {sop_instance_uid} after {attempt_count} attempts: {error}")
+            logger.error(
+                "Upload permanently failed for %s after %d attempts: %s", sop_instance_uid, attempt_count, error
+            )
         else:
             logger.warning(
-                f"Upload failed for {sop_instance_uid} (attempt {attempt_count}/{self.max_retries}): {error}"
+                "Upload failed for %s (attempt %d/%d): %s", sop_instance_uid, attempt_count, self.max_retries, error
             )
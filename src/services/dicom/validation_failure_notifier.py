@@ -26,7 +26,7 @@ class ValidationFailureNotifier:
 
     def notify(self, source_message_id: str, error: str) -> bool:
         try:
-            logger.info(f"Reporting validation failure for action {source_message_id}")
+            logger.info("Reporting validation failure for action %s", source_message_id)
 
             response = requests.patch(
                 f"{self.api_endpoint}/{source_message_id}/failure",
@@ -37,18 +37,20 @@ class ValidationFailureNotifier:
             )
 
             if response.status_code == 200:
-                logger.info(f"Validation failure reported for action {source_message_id}")
+                logger.info("Validation failure reported for action %s", source_message_id)
                 return True
             else:
                 logger.error(
-                    f"Failed to report validation failure for {source_message_id}: "
-                    f"status {response.status_code}, body: {response.text}"
+                    "Failed to report validation failure for %s: status %d, body: %s",
+                    source_message_id,
+                    response.status_code,
+                    response.text,
                 )
                 return False
 
         except requests.exceptions.Timeout:
-            logger.error(f"Timeout reporting validation failure for {source_message_id} after {self.timeout}s")
+            logger.error("Timeout reporting validation failure for %s after %ss", source_message_id, self.timeout)
             return False
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error reporting validation failure for {source_message_id}: {e}", exc_info=True)
+            logger.error("Error reporting validation failure for %s: %s", source_message_id, e, exc_info=True)
             return False
@@ -14,9 +14,10 @@ class DicomValidationError(Exception):
 
 
 class DicomValidator:
-    REQUIRED_TAGS = ["SOPInstanceUID", "PatientID", "StudyInstanceUID", "SOPClassUID"]
+    REQUIRED_TAGS = ("SOPInstanceUID", "PatientID", "StudyInstanceUID", "SOPClassUID")
     DICOM_PREFIX = b"DICM"
     PREAMBLE_LENGTH = 128
+    MIN_SIZE = PREAMBLE_LENGTH + len(DICOM_PREFIX)
 
     def validate_dataset(self, ds: Dataset) -> None:
         """Validate dataset has required DICOM tags."""
@@ -27,12 +28,12 @@ class DicomValidator:
 
     def validate_bytes(self, data: bytes) -> None:
         """Validate serialized DICOM bytes have valid preamble."""
-        min_size = self.PREAMBLE_LENGTH + len(self.DICOM_PREFIX)
-        if len(data) < min_size:
+        if len(data) < self.MIN_SIZE:
             raise DicomValidationError(f"DICOM too small ({len(data)} bytes), missing preamble")
 
-        preamble = data[self.PREAMBLE_LENGTH : self.PREAMBLE_LENGTH + 4]
-        if preamble != self.DICOM_PREFIX:
+        # startswith at an offset compares in place, without slicing a copy of the prefix
+        if not data.startswith(self.DICOM_PREFIX, self.PREAMBLE_LENGTH):
+            preamble = data[self.PREAMBLE_LENGTH : self.PREAMBLE_LENGTH + 4]
             raise DicomValidationError(f"Invalid DICOM prefix: {preamble!r}, expected {self.DICOM_PREFIX!r}")
 
     def validate_pixel_data(self, ds: Dataset) -> None:
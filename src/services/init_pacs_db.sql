@@ -34,4 +34,6 @@ CREATE INDEX IF NOT EXISTS idx_patient_id ON stored_instances(patient_id);
 CREATE INDEX IF NOT EXISTS idx_accession_number ON stored_instances(accession_number);
 CREATE INDEX IF NOT EXISTS idx_created_at ON stored_instances(created_at);
 CREATE INDEX IF NOT EXISTS idx_storage_hash ON stored_instances(storage_hash);
-CREATE INDEX IF NOT EXISTS idx_upload_status ON stored_instances(upload_status);
+DROP INDEX IF EXISTS idx_upload_status;
+CREATE INDEX IF NOT EXISTS idx_upload_pending ON stored_instances(upload_status, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_status_created_at ON stored_instances(status, created_at);
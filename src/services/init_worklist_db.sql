@@ -40,9 +40,11 @@ CREATE TABLE IF NOT EXISTS worklist_items (
     source_message_id TEXT
 );
 
--- Index for the most common query pattern (MWL C-FIND by modality and date)
-CREATE INDEX IF NOT EXISTS idx_worklist_date_modality
-ON worklist_items(scheduled_date, modality);
+-- Index for the most common query pattern (MWL C-FIND by date range and modality,
+-- returned in scheduled date and time order)
+DROP INDEX IF EXISTS idx_worklist_date_modality;
+CREATE INDEX IF NOT EXISTS idx_worklist_scheduled
+ON worklist_items(scheduled_date, scheduled_time, modality);
 
 -- Index for status queries (finding in-progress procedures, etc.)
 CREATE INDEX IF NOT EXISTS idx_worklist_status
@@ -37,7 +37,7 @@ class CFind:
         identifier = event.identifier
         requestor_aet = event.assoc.requestor.ae_title
 
-        logger.info(f"C-FIND request from {requestor_aet}")
+        logger.info("C-FIND request from %s", requestor_aet)
 
         query_patient_id = identifier.get("PatientID")
         anonymised_patient_id = f"*******{query_patient_id[7:]}" if query_patient_id else "None"
@@ -34,14 +34,14 @@ class CreateWorklistItem:
                     source_message_id=action_id,
                 )
             )
-            logger.info(f"Created worklist item: {accession_number}")
+            logger.info("Created worklist item: %s", accession_number)
             return {"status": "created", "action_id": action_id}
         except WorklistItemExistsError:
-            logger.info(f"Worklist item exists: accession_number={accession_number}, action_id={action_id!r}")
+            logger.info("Worklist item exists: accession_number=%s, action_id=%r", accession_number, action_id)
             return {"status": "exists", "action_id": action_id}
         except KeyError as e:
-            logger.error(f"Missing key in payload: {e}")
+            logger.error("Missing key in payload: %s", e)
             return {"status": "error", "message": f"Missing key: {e}"}
         except Exception as e:
-            logger.error(f"Failed to create worklist item: {e}")
+            logger.error("Failed to create worklist item: %s", e)
             return {"status": "error", "message": str(e)}
@@ -31,16 +31,19 @@ class NSet:
                 logger.warning("MPPS N-SET: Invalid PerformedProcedureStepStatus: %s", status)
                 return INVALID_ATTRIBUTE, None
 
-            worklist_item = self.storage.get_worklist_item_by_mpps_instance_uid(requested_sop_instance_uid)
-            if not worklist_item:
-                logger.warning(
-                    "MPPS N-SET: No worklist item found for SOP Instance UID: %s", requested_sop_instance_uid
-                )
-                return UNKNOWN_SOP_INSTANCE, None
+            updated = self.storage.update_status_by_mpps_instance_uid(requested_sop_instance_uid, status)
+            if updated is None:
+                # Nothing was updated; only now look up why, to pick the right status code
+                if not self.storage.get_worklist_item_by_mpps_instance_uid(requested_sop_instance_uid):
+                    logger.warning(
+                        "MPPS N-SET: No worklist item found for SOP Instance UID: %s", requested_sop_instance_uid
+                    )
+                    return UNKNOWN_SOP_INSTANCE, None
 
-            accession_number = worklist_item.accession_number
+                logger.warning("MPPS N-SET: Failed to update database with new status")
+                return PROCESSING_FAILURE, None
 
-            source_message_id = self.storage.update_status(accession_number, status)
+            accession_number, source_message_id = updated
             if source_message_id:
                 logger.info("Database updated: %s -> %s", accession_number, status)
 
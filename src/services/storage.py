@@ -2,10 +2,13 @@ import hashlib
 import logging
 import os
 import sqlite3
+import threading
+import uuid
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
+import config
 from models import WorklistItem
 from services.mwl import MWLStatusManager
 
@@ -17,36 +20,81 @@ class InstanceExistsError(Exception):
 
 
 class Storage:
-    def __init__(self, db_path: str, schema_path: str, table_name: str):
+    def __init__(self, db_path: str, schema_path: str):
         """
         Initialize storage with database.
         Args:
             db_path: Path to SQLite database
             schema_path: Path to SQL schema file
-            table_name: Name of the main table to check for existence
         """
         self.db_path = db_path
         self.schema_path = schema_path
-        self.table_name = table_name
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
         self._ensure_db()
 
-        # Enable WAL mode for better concurrent access
+        # Enable WAL mode for better concurrent access. Unlike the per-connection
+        # pragmas below, the journal mode is persisted in the database file.
         with self._get_connection() as conn:
             conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
             conn.commit()
 
     @contextmanager
     def _get_connection(self):
-        """Get a database connection with proper error handling."""
-        conn = None
+        """
+        Get the calling thread's database connection.
+
+        Connections are opened once per thread and reused, since pynetdicom and
+        asyncio.to_thread run handlers on their own threads. Any transaction left
+        uncommitted, including by an error, is rolled back on exit.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+
         try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
-            conn.row_factory = sqlite3.Row
             yield conn
         finally:
-            if conn:
+            if conn.in_transaction:
+                conn.rollback()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        # check_same_thread is off only so close() can run from another thread;
+        # each connection is otherwise only used by the thread that opened it.
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+
+        with self._connections_lock:
+            # Threads come and go with DICOM associations; close connections they left behind
+            for thread in [thread for thread in self._connections if not thread.is_alive()]:
+                self._connections.pop(thread).close()
+            self._connections[threading.current_thread()] = conn
+
+        self._local.conn = conn
+        return conn
+
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply per-connection pragmas, which SQLite resets on every connect."""
+        conn.executescript(
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA cache_size=-65536;"
+            f"PRAGMA mmap_size={config.sqlite_mmap_size()};"
+        )
+
+    def close(self):
+        """Refresh planner statistics and close every thread's database connection."""
+        with self._connections_lock:
+            for conn in self._connections.values():
+                try:
+                    conn.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    logger.debug("PRAGMA optimize skipped on close: %s", e)
                 conn.close()
+            self._connections.clear()
+            self._local = threading.local()
 
     def _ensure_db(self):
         """Ensure database exists and has correct schema."""
@@ -54,12 +102,14 @@ class Storage:
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
+        logger.debug("Applying database schema from %s", self.schema_path)
         with self._get_connection() as conn:
-            cursor = conn.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{self.table_name}'")
-            if cursor.fetchone() is None:
-                logger.info(f"Initializing database schema from {self.schema_path}")
-                conn.executescript(Path(self.schema_path).read_text())
-                conn.commit()
+            # The schema only uses IF NOT EXISTS, so reapplying it adds any new indexes to existing databases
+            conn.executescript(Path(self.schema_path).read_text())
+            conn.commit()
+
+            # Refresh query planner statistics where they are missing or stale
+            conn.execute("PRAGMA optimize")
 
 
 class PACSStorage(Storage):
@@ -69,6 +119,24 @@ class PACSStorage(Storage):
     Manages DICOM image storage using hash-based directory structure and SQLite database.
     """
 
+    INSERT_INSTANCE_SQL = """
+        INSERT INTO stored_instances (
+            sop_instance_uid, storage_path, file_size, storage_hash,
+            patient_id, patient_name, accession_number, source_aet,
+            status
+        ) VALUES (
+            ?, ?, ?, ?,
+            ?, ?, ?, ?,
+            'STORED'
+        )
+    """
+    SELECT_INSTANCE_SQL = """
+        SELECT sop_instance_uid, storage_path, accession_number, patient_id,
+               patient_name, file_size, status, upload_status, upload_error,
+               upload_attempt_count, created_at
+        FROM stored_instances
+    """
+
     def __init__(self, db_path: str = "/var/lib/pacs/pacs.db", storage_root: str = "/var/lib/pacs/storage"):
         """
         Initialize PACS storage.
@@ -77,7 +145,7 @@ class PACSStorage(Storage):
             db_path: Path to SQLite database
             storage_root: Root directory for DICOM file storage
         """
-        super().__init__(db_path, f"{Path(__file__).parent}/init_pacs_db.sql", "stored_instances")
+        super().__init__(db_path, f"{Path(__file__).parent}/init_pacs_db.sql")
         self.storage_root = Path(storage_root)
         self.storage_root.mkdir(parents=True, exist_ok=True)
 
@@ -122,39 +190,53 @@ class PACSStorage(Storage):
         if self.instance_exists(sop_instance_uid):
             raise InstanceExistsError(f"Instance already exists: {sop_instance_uid}")
 
-        rel_path, abs_path, file_size, storage_hash = self.store_file(sop_instance_uid, file_data)
+        rel_path, temp_path, file_size, storage_hash = self._write_temp_file(sop_instance_uid, file_data)
+        abs_path = self.storage_root / rel_path
 
-        # Store metadata in database
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO stored_instances (
-                    sop_instance_uid, storage_path, file_size, storage_hash,
-                    patient_id, patient_name, accession_number, source_aet,
-                    status
-                ) VALUES (
-                    ?, ?, ?, ?,
-                    ?, ?, ?, ?,
-                    'STORED'
-                )
-            """,
-                (
-                    sop_instance_uid,
-                    str(rel_path),
-                    file_size,
-                    storage_hash,
-                    metadata.get("patient_id"),
-                    metadata.get("patient_name"),
-                    metadata.get("accession_number"),
-                    source_aet,
-                ),
-            )
-            conn.commit()
+        try:
+            try:
+                with self._get_connection() as conn:
+                    conn.execute(
+                        self.INSERT_INSTANCE_SQL,
+                        (
+                            sop_instance_uid,
+                            str(rel_path),
+                            file_size,
+                            storage_hash,
+                            metadata.get("patient_id"),
+                            metadata.get("patient_name"),
+                            metadata.get("accession_number"),
+                            source_aet,
+                        ),
+                    )
+                    conn.commit()
+            except sqlite3.IntegrityError:
+                # Another association stored the same instance after the existence check;
+                # any other conflict (e.g. an archived or deleted row) is a genuine failure
+                if self.instance_exists(sop_instance_uid):
+                    raise InstanceExistsError(f"Instance already exists: {sop_instance_uid}") from None
+                raise
+
+            # Only the store whose row was committed moves its bytes into place
+            try:
+                os.replace(temp_path, abs_path)
+            except OSError:
+                self._delete_instance_row(sop_instance_uid)
+                raise
+        finally:
+            # Still present only when the instance was not stored
+            temp_path.unlink(missing_ok=True)
 
-        logger.info(f"Stored instance: {sop_instance_uid} -> {rel_path} ({file_size} bytes)")
+        logger.info("Stored instance: %s -> %s (%d bytes)", sop_instance_uid, rel_path, file_size)
 
         return str(abs_path)
 
+    def _delete_instance_row(self, sop_instance_uid: str) -> None:
+        """Remove an instance row whose file could not be moved into place."""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM stored_instances WHERE sop_instance_uid = ?", (sop_instance_uid,))
+            conn.commit()
+
     def instance_exists(self, sop_instance_uid: str) -> bool:
         """Check if instance exists in database."""
         with self._get_connection() as conn:
@@ -167,51 +249,53 @@ class PACSStorage(Storage):
         """
         Store file data on disk in hash-based directory structure.
         """
-        rel_path = self._compute_storage_path(sop_instance_uid)
+        rel_path, temp_path, file_size, storage_hash = self._write_temp_file(sop_instance_uid, file_data)
         abs_path = self.storage_root / rel_path
+        os.replace(temp_path, abs_path)
 
-        abs_path.parent.mkdir(parents=True, exist_ok=True)
+        return (rel_path, abs_path, file_size, storage_hash)
+
+    def _write_temp_file(self, sop_instance_uid: str, file_data: bytes) -> tuple[str, Path, int, str]:
+        """
+        Write file data to a uniquely named temporary file in its hash-based storage directory.
+
+        store_instance moves the file to its final path only once the instance row is committed,
+        so a concurrent store of the same UID cannot overwrite a file another store recorded.
+
+        Returns:
+            Tuple of (relative storage path, temporary file path, file size, SHA-256 hex digest)
+        """
+        rel_path = self._compute_storage_path(sop_instance_uid)
+        temp_path = self.storage_root / f"{rel_path}.{uuid.uuid4().hex}.tmp"
 
-        abs_path.write_bytes(file_data)
+        # Most hash directories already exist, so only create them when the write fails
+        try:
+            temp_path.write_bytes(file_data)
+        except FileNotFoundError:
+            temp_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(file_data)
         file_size = len(file_data)
 
         storage_hash = hashlib.sha256(file_data).hexdigest()
 
-        return (rel_path, abs_path, file_size, storage_hash)
+        return (rel_path, temp_path, file_size, storage_hash)
 
     def close(self):
-        """Close storage (cleanup if needed)."""
+        """Close storage database connections."""
+        super().close()
         logger.info("PACS storage closed")
 
     def get_instance(self, sop_instance_uid: str) -> Optional[Dict]:
         """Get a stored instance by SOP Instance UID."""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT sop_instance_uid, storage_path, accession_number, patient_id,
-                       patient_name, file_size, status, upload_status, upload_error,
-                       upload_attempt_count, created_at
-                FROM stored_instances
-                WHERE sop_instance_uid = ?
-                """,
-                (sop_instance_uid,),
-            )
+            cursor = conn.execute(f"{self.SELECT_INSTANCE_SQL} WHERE sop_instance_uid = ?", (sop_instance_uid,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
     def get_instance_by_accession(self, accession_number: str) -> Optional[Dict]:
         """Get a stored instance by accession number."""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT sop_instance_uid, storage_path, accession_number, patient_id,
-                       patient_name, file_size, status, upload_status, upload_error,
-                       upload_attempt_count, created_at
-                FROM stored_instances
-                WHERE accession_number = ?
-                """,
-                (accession_number,),
-            )
+            cursor = conn.execute(f"{self.SELECT_INSTANCE_SQL} WHERE accession_number = ?", (accession_number,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
@@ -292,6 +376,23 @@ class WorklistItemExistsError(Exception):
 
 
 class MWLStorage(Storage):
+    INSERT_WORKLIST_ITEM_SQL = (
+        "INSERT INTO worklist_items (accession_number, modality, patient_birth_date, "
+        "patient_id, patient_name, patient_sex, procedure_code, scheduled_date, "
+        "scheduled_time, source_message_id, study_description, study_instance_uid) "
+        "VALUES (:accession_number, :modality, :patient_birth_date, "
+        ":patient_id, :patient_name, :patient_sex, :procedure_code, "
+        ":scheduled_date, :scheduled_time, :source_message_id, "
+        ":study_description, :study_instance_uid)"
+    )
+
+    SELECT_WORKLIST_ITEM_SQL = (
+        "SELECT accession_number, modality, patient_birth_date, patient_id, "
+        "patient_name, patient_sex, procedure_code, scheduled_date, scheduled_time, "
+        "source_message_id, study_description, study_instance_uid, status, mpps_instance_uid "
+        "FROM worklist_items"
+    )
+
     def __init__(self, db_path: str = "/var/lib/pacs/worklist.db"):
         """
         Initialize Worklist storage.
@@ -299,7 +400,7 @@ class MWLStorage(Storage):
         Args:
             db_path: Path to SQLite database
         """
-        super().__init__(db_path, f"{Path(__file__).parent}/init_worklist_db.sql", "worklist_items")
+        super().__init__(db_path, f"{Path(__file__).parent}/init_worklist_db.sql")
         logger.info(f"Worklist storage initialized: db={db_path}")
 
     def store_worklist_item(
@@ -320,24 +421,37 @@ class MWLStorage(Storage):
         """
         try:
             with self._get_connection() as conn:
-                conn.execute(
-                    (
-                        "INSERT INTO worklist_items (accession_number, modality, patient_birth_date, "
-                        "patient_id, patient_name, patient_sex, procedure_code, scheduled_date, "
-                        "scheduled_time, source_message_id, study_description, study_instance_uid) "
-                        "VALUES (:accession_number, :modality, :patient_birth_date, "
-                        ":patient_id, :patient_name, :patient_sex, :procedure_code, "
-                        ":scheduled_date, :scheduled_time, :source_message_id, "
-                        ":study_description, :study_instance_uid)"
-                    ),
-                    worklist_item.__dict__,
-                )
+                conn.execute(self.INSERT_WORKLIST_ITEM_SQL, worklist_item.__dict__)
                 conn.commit()
         except sqlite3.IntegrityError:
             raise WorklistItemExistsError(f"Worklist item already exists: {worklist_item.accession_number}")
 
         return worklist_item.accession_number
 
+    def store_worklist_items(self, worklist_items: Iterable[WorklistItem]) -> int:
+        """
+        Add many worklist items in a single transaction.
+
+        One commit (and so one fsync) covers the whole batch rather than one per item.
+
+        Args:
+            worklist_items: WorklistItem dataclass instances
+
+        Returns:
+            The number of items created
+
+        Raises:
+            WorklistItemExistsError: If any accession number already exists. No items are stored.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.executemany(self.INSERT_WORKLIST_ITEM_SQL, (item.__dict__ for item in worklist_items))
+                conn.commit()
+        except sqlite3.IntegrityError as e:
+            raise WorklistItemExistsError(f"Worklist item already exists: {e}")
+
+        return cursor.rowcount
+
     def find_worklist_items(
         self,
         accession_number: Optional[str] = None,
@@ -361,12 +475,7 @@ class MWLStorage(Storage):
         Returns:
             List of WorklistItem instances matching the criteria
         """
-        query = (
-            "SELECT accession_number, modality, patient_birth_date, patient_id, "
-            "patient_name, patient_sex, procedure_code, scheduled_date, scheduled_time, "
-            "source_message_id, study_description, study_instance_uid, status, mpps_instance_uid "
-            "FROM worklist_items"
-        )
+        query = self.SELECT_WORKLIST_ITEM_SQL
         where_clauses = ["status NOT IN ('COMPLETED', 'DISCONTINUED')"]
         params = []
 
@@ -443,15 +552,7 @@ class MWLStorage(Storage):
             WorklistItem instance, or None if not found
         """
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                (
-                    "SELECT accession_number, modality, patient_birth_date, patient_id, "
-                    "patient_name, patient_sex, procedure_code, scheduled_date, scheduled_time, "
-                    "source_message_id, study_description, study_instance_uid, status, mpps_instance_uid "
-                    "FROM worklist_items WHERE accession_number = ?"
-                ),
-                (accession_number,),
-            )
+            cursor = conn.execute(f"{self.SELECT_WORKLIST_ITEM_SQL} WHERE accession_number = ?", (accession_number,))
             row = cursor.fetchone()
 
         return WorklistItem(**row) if row else None
@@ -481,20 +582,51 @@ class MWLStorage(Storage):
                     updated_at = CURRENT_TIMESTAMP
                 WHERE accession_number = ?
                   AND status = ?
+                RETURNING source_message_id
                 """,
                 (to_status.value, mpps_instance_uid, accession_number, from_status.value),
             )
+            result = cursor.fetchone()
             conn.commit()
 
-            if cursor.rowcount == 0:
-                return None
-
-            result = conn.execute(
-                "SELECT source_message_id FROM worklist_items WHERE accession_number = ?",
-                (accession_number,),
-            ).fetchone()
             return result["source_message_id"] if result is not None else None
 
+    def update_status_by_mpps_instance_uid(
+        self, mpps_instance_uid: str | None, status: str
+    ) -> Optional[tuple[str, Optional[str]]]:
+        """
+        Transition the worklist item linked to an MPPS instance to a new status.
+
+        Args:
+            mpps_instance_uid: The MPPS instance UID of the worklist item to update
+            status: Target status
+
+        Returns:
+            (accession_number, source_message_id) if item was updated, None if not found
+            or not in a status that can move to the target
+        """
+        if mpps_instance_uid is None:
+            return None
+
+        from_status, to_status = MWLStatusManager.transition_for(status)
+
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE worklist_items
+                SET status = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE mpps_instance_uid = ?
+                  AND status = ?
+                RETURNING accession_number, source_message_id
+                """,
+                (to_status.value, mpps_instance_uid, from_status.value),
+            )
+            result = cursor.fetchone()
+            conn.commit()
+
+            return (result["accession_number"], result["source_message_id"]) if result is not None else None
+
     def update_study_instance_uid(self, accession_number: str, study_instance_uid: str) -> bool:
         """
         Update the study instance UID for a worklist item.
@@ -554,6 +686,25 @@ class MWLStorage(Storage):
             row = cursor.fetchone()
             return row["source_message_id"] if row and row["source_message_id"] else None
 
+    def get_source_message_ids(self, accession_numbers: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the source_message_id for several worklist items in one query.
+
+        Items that are missing or have no source_message_id are left out of the result.
+        """
+        accession_numbers = list(dict.fromkeys(accession_numbers))
+        if not accession_numbers:
+            return {}
+
+        placeholders = ", ".join("?" * len(accession_numbers))
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT accession_number, source_message_id FROM worklist_items "
+                f"WHERE accession_number IN ({placeholders})",
+                accession_numbers,
+            )
+            return {row["accession_number"]: row["source_message_id"] for row in cursor if row["source_message_id"]}
+
     def mpps_instance_exists(self, mpps_instance_uid: str) -> bool:
         """Check if an MPPS instance UID already exists in any worklist item."""
         with self._get_connection() as conn:
@@ -566,14 +717,6 @@ class MWLStorage(Storage):
             return None
 
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                (
-                    "SELECT accession_number, modality, patient_birth_date, patient_id, "
-                    "patient_name, patient_sex, procedure_code, scheduled_date, scheduled_time, "
-                    "source_message_id, study_description, study_instance_uid, status, mpps_instance_uid "
-                    "FROM worklist_items WHERE mpps_instance_uid = ?"
-                ),
-                (mpps_instance_uid,),
-            )
+            cursor = conn.execute(f"{self.SELECT_WORKLIST_ITEM_SQL} WHERE mpps_instance_uid = ?", (mpps_instance_uid,))
             row = cursor.fetchone()
             return WorklistItem(**row) if row else None
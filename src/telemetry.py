@@ -1,5 +1,10 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+import config
 
 logger = logging.getLogger(__name__)
 
@@ -31,3 +36,24 @@ def configure_telemetry(service_name: str | None = None) -> None:
 
     configure_azure_monitor()
     logger.info("Azure Monitor telemetry configured")
+
+
+def configure_logging() -> None:
+    """Configure root logging with output written on a background thread.
+
+    Log calls only enqueue the record, so DICOM association threads never
+    block on writing to stderr or the service log file.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(config.log_format()))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The queued record is already merged with its args; the listener's handler applies LOG_FORMAT
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    logging.basicConfig(level=config.log_level(), handlers=[queue_handler])
@@ -3,16 +3,14 @@
 import logging
 import os
 
-from dotenv import load_dotenv
-
 import config
 from services.dicom.dicom_uploader import DICOMUploader
 from services.dicom.upload_listener import UploadListener
 from services.dicom.upload_processor import UploadProcessor
 from services.storage import MWLStorage, PACSStorage
-from telemetry import configure_telemetry
+from telemetry import configure_logging, configure_telemetry
 
-load_dotenv()
+config.load_env_file()
 
 
 def main():
@@ -28,25 +26,25 @@ def main():
     PACS_STORAGE_PATH: Path to the directory where DICOM files are stored (default: /var/lib/pacs/storage)
     UPLOAD_POLL_INTERVAL: Time in seconds between polling for new uploads (default: 2)
     UPLOAD_BATCH_SIZE: Number of pending uploads to process in each batch (default: 10)
+    UPLOAD_MAX_WORKERS: Number of uploads to run concurrently within a batch (default: 4)
     """
-    logging.basicConfig(
-        level=config.log_level(),
-        format=config.log_format(),
-    )
+    configure_logging()
 
     poll_interval = float(os.getenv("UPLOAD_POLL_INTERVAL", "2"))
     batch_size = int(os.getenv("UPLOAD_BATCH_SIZE", "10"))
     max_retries = int(os.getenv("MAX_UPLOAD_RETRIES", "3"))
+    max_workers = int(os.getenv("UPLOAD_MAX_WORKERS", "4"))
 
     pacs_storage = PACSStorage(config.pacs_db_path(), config.pacs_storage_path())
     mwl_storage = MWLStorage(config.mwl_db_path())
-    uploader = DICOMUploader()
+    uploader = DICOMUploader(pool_size=max_workers)
 
     processor = UploadProcessor(
         pacs_storage=pacs_storage,
         mwl_storage=mwl_storage,
         uploader=uploader,
         max_retries=max_retries,
+        max_workers=max_workers,
     )
 
     listener = UploadListener(
@@ -58,13 +56,14 @@ def main():
     logging.info("=" * 60)
     logging.info("Starting DICOM upload listener service")
     logging.info("=" * 60)
-    logging.info(f"PACS DB: {pacs_storage.db_path}")
-    logging.info(f"Worklist DB: {mwl_storage.db_path}")
-    logging.info(f"Storage: {pacs_storage.storage_root}")
-    logging.info(f"Poll interval: {poll_interval}s")
-    logging.info(f"Batch size: {batch_size}")
-    logging.info(f"Max retries: {max_retries}")
-    logging.info(f"API endpoint: {uploader.api_endpoint}")
+    logging.info("PACS DB: %s", pacs_storage.db_path)
+    logging.info("Worklist DB: %s", mwl_storage.db_path)
+    logging.info("Storage: %s", pacs_storage.storage_root)
+    logging.info("Poll interval: %ss", poll_interval)
+    logging.info("Batch size: %s", batch_size)
+    logging.info("Max retries: %s", max_retries)
+    logging.info("Max workers: %s", max_workers)
+    logging.info("API endpoint: %s", uploader.api_endpoint)
     logging.info("=" * 60)
 
     configure_telemetry(service_name="upload-listener")
@@ -74,6 +73,9 @@ def main():
     except KeyboardInterrupt:
         logging.info("Received shutdown signal")
         listener.stop()
+    finally:
+        processor.close()
+        uploader.close()
 
 
 if __name__ == "__main__":
@@ -205,7 +205,7 @@ class TestEndToEndRelayToUpload:
         mock_response = Mock()
         mock_response.status_code = 201
 
-        with patch("services.dicom.dicom_uploader.requests.put") as mock_put:
+        with patch("services.dicom.dicom_uploader.requests.Session.put") as mock_put:
             mock_put.return_value = mock_response
 
             uploader = DICOMUploader(api_endpoint="http://test-manage-api/dicom")
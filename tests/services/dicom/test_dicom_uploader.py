@@ -1,5 +1,7 @@
 import io
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pydicom
@@ -9,7 +11,7 @@ import requests
 from services.dicom.dicom_uploader import DICOMUploader
 
 
-@patch("services.dicom.dicom_uploader.requests.put")
+@patch("services.dicom.dicom_uploader.requests.Session.put")
 class TestDICOMUploader:
     @pytest.fixture
     def dicom_file(self):
@@ -50,6 +52,68 @@ class TestDICOMUploader:
         assert isinstance(file_tuple[1], io.BufferedReader)
         assert file_tuple[1].read() == open(dicom_file, "rb").read()
 
+    def test_upload_reuses_session(self, mock_put, dicom_file):
+        """Uploads share one HTTP session so connections are kept alive."""
+        mock_put.return_value = Mock(status_code=201)
+
+        uploader = DICOMUploader(api_endpoint="http://test.com/api/upload")
+        session = uploader.session
+        uploader.upload_dicom("1.2.3", open(dicom_file, "rb"), "ACTION1")
+        uploader.upload_dicom("1.2.4", open(dicom_file, "rb"), "ACTION2")
+
+        assert uploader.session is session
+        assert mock_put.call_count == 2
+
+    def test_concurrent_uploads_use_a_session_per_thread(self, mock_put, dicom_file):
+        """Concurrent uploads, more than a session's default pool size, each use their own session."""
+        workers = 12  # above requests' default pool_maxsize of 10
+        all_uploading = threading.Barrier(workers)
+
+        def put(*args, **kwargs):
+            all_uploading.wait(timeout=5)
+            return Mock(status_code=201)
+
+        mock_put.side_effect = put
+        uploader = DICOMUploader(api_endpoint="http://test.com/api/upload")
+
+        def upload(index):
+            with open(dicom_file, "rb") as stream:
+                assert uploader.upload_dicom(f"1.2.{index}", stream, f"ACTION{index}")
+            return uploader.session
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sessions = list(executor.map(upload, range(workers)))
+
+        assert len({id(session) for session in sessions}) == workers
+
+        with patch.object(requests.Session, "close") as mock_close:
+            uploader.close()
+
+        assert mock_close.call_count == workers
+
+    def test_session_retries_gateway_errors(self, _):
+        """Each session mounts an adapter that retries PUTs on 502/503/504 with backoff."""
+        uploader = DICOMUploader(api_endpoint="https://test.com/api/upload", pool_size=6)
+
+        for prefix in ("https://", "http://"):
+            adapter = uploader.session.get_adapter(f"{prefix}test.com")
+            retry = adapter.max_retries
+
+            assert retry.total == 3
+            assert retry.backoff_factor == 0.5
+            assert set(retry.status_forcelist) == {502, 503, 504}
+            assert "PUT" in retry.allowed_methods
+            assert adapter._pool_maxsize == 6
+
+    def test_close_closes_session(self, _):
+        """Closing the uploader closes its HTTP session."""
+        uploader = DICOMUploader()
+
+        with patch.object(uploader.session, "close") as mock_close:
+            uploader.close()
+
+        mock_close.assert_called_once()
+
     def test_upload_without_action_id(self, _, dicom_file):
         """Upload without action_id does not make request."""
         uploader = DICOMUploader()
@@ -52,6 +52,16 @@ class TestImageCompressor:
 
         assert compressed_twice.file_meta.TransferSyntaxUID == JPEG2000
 
+    def test_compress_skips_jpeg2000_dataset_that_needs_no_resize(self, dataset_with_pixels):
+        """JPEG 2000 datasets already at thumbnail size are returned without re-encoding."""
+        compressed_ds = ImageCompressor().compress(dataset_with_pixels)
+
+        with patch("services.dicom.image_compressor.compress") as mock_compress:
+            result = ImageCompressor().compress(compressed_ds)
+
+        assert result is compressed_ds
+        mock_compress.assert_not_called()
+
     @patch("services.dicom.image_compressor.compress")
     def test_compress_failure_returns_resized_uncompressed(self, mock_compress, dataset_with_pixels):
         """Compress failure returns resized uncompressed."""
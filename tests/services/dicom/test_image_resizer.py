@@ -27,6 +27,14 @@ class TestImageResizer:
         assert resized_ds.Rows == 256
         assert resized_ds.Columns == 256
 
+    def test_needs_resize(self, dataset_with_pixels):
+        """Only images larger than the thumbnail size need resizing."""
+        subject = ImageResizer(thumbnail_size=256)
+        assert subject.needs_resize(dataset_with_pixels) is False
+
+        dataset_with_pixels.Columns = 257
+        assert subject.needs_resize(dataset_with_pixels) is True
+
     def test_resize_preserves_bit_depth(self, dataset_with_pixels):
         """Resize preserves bit depth."""
         dataset_with_pixels.Rows = 1000
@@ -38,3 +46,98 @@ class TestImageResizer:
         resized_ds = subject.resize(dataset_with_pixels)
 
         assert resized_ds.BitsAllocated == 16
+
+    def test_resize_keeps_full_16_bit_precision(self, dataset_with_pixels):
+        """16-bit pixels are resampled without quantizing them to 8 bits."""
+        dataset_with_pixels.Rows = 1000
+        dataset_with_pixels.Columns = 1000
+        dataset_with_pixels.PixelData = np.full((1000, 1000), 3001, dtype=np.uint16).tobytes()
+
+        resized_ds = ImageResizer(thumbnail_size=500).resize(dataset_with_pixels)
+
+        assert (resized_ds.pixel_array == 3001).all()
+
+    def test_resize_clamps_overshoot_to_pixel_type(self, dataset_with_pixels):
+        """Lanczos overshoot at hard edges is clamped to the pixel type's range."""
+        pixel_array = np.zeros((1000, 1000), dtype=np.uint16)
+        pixel_array[:, 500:] = 65535
+        dataset_with_pixels.Rows = 1000
+        dataset_with_pixels.Columns = 1000
+        dataset_with_pixels.PixelData = pixel_array.tobytes()
+
+        resized_ds = ImageResizer(thumbnail_size=300).resize(dataset_with_pixels)
+
+        assert resized_ds.pixel_array.min() == 0
+        assert resized_ds.pixel_array.max() == 65535
+
+    def test_resize_clamps_overshoot_to_bits_stored(self, dataset_with_pixels):
+        """Lanczos overshoot is clamped to the BitsStored range, not the 16-bit container."""
+        pixel_array = np.zeros((1000, 1000), dtype=np.uint16)
+        pixel_array[:, 500:] = 4095
+        dataset_with_pixels.Rows = 1000
+        dataset_with_pixels.Columns = 1000
+        dataset_with_pixels.BitsStored = 12
+        dataset_with_pixels.HighBit = 11
+        dataset_with_pixels.PixelData = pixel_array.tobytes()
+
+        resized_ds = ImageResizer(thumbnail_size=300).resize(dataset_with_pixels)
+
+        # Read the raw values; pixel_array would mask off bits above HighBit and hide a wrap
+        resized = np.frombuffer(resized_ds.PixelData, dtype=np.uint16)
+        assert resized.min() == 0
+        assert resized.max() == 4095
+
+    def test_resize_clamps_overshoot_to_signed_bits_stored(self, dataset_with_pixels):
+        """Signed pixels are clamped to the signed BitsStored range."""
+        pixel_array = np.full((1000, 1000), -2048, dtype=np.int16)
+        pixel_array[:, 500:] = 2047
+        dataset_with_pixels.Rows = 1000
+        dataset_with_pixels.Columns = 1000
+        dataset_with_pixels.BitsStored = 12
+        dataset_with_pixels.HighBit = 11
+        dataset_with_pixels.PixelRepresentation = 1
+        dataset_with_pixels.PixelData = pixel_array.tobytes()
+
+        resized_ds = ImageResizer(thumbnail_size=300).resize(dataset_with_pixels)
+
+        resized = np.frombuffer(resized_ds.PixelData, dtype=np.int16)
+        assert resized.min() == -2048
+        assert resized.max() == 2047
+
+    def test_reducing_gap_is_configurable(self, monkeypatch):
+        """The reducing gap comes from DICOM_RESIZE_REDUCING_GAP; 0 turns pre-reduction off."""
+        monkeypatch.delenv("DICOM_RESIZE_REDUCING_GAP", raising=False)
+        assert ImageResizer().reducing_gap == 3.0
+
+        monkeypatch.setenv("DICOM_RESIZE_REDUCING_GAP", "2")
+        assert ImageResizer().reducing_gap == 2.0
+
+        monkeypatch.setenv("DICOM_RESIZE_REDUCING_GAP", "0")
+        assert ImageResizer().reducing_gap is None
+        assert ImageResizer(reducing_gap=5).reducing_gap == 5
+
+    def test_reducing_gap_output_matches_plain_lanczos(self, dataset_with_pixels):
+        """Pre-reduced output stays close to a plain Lanczos resize of the same image."""
+        rng = np.random.default_rng(0)
+        # Large enough that a gap of 3 pre-reduces 3x before Lanczos runs
+        rows, cols = np.mgrid[0:3600, 0:2700]
+        # Smooth anatomy-like gradients with sensor noise on top, in the 12-bit range
+        pixel_array = 2000 + 1000 * np.sin(rows / 270) * np.cos(cols / 210) + rng.normal(0, 50, (3600, 2700))
+        pixel_array = np.clip(pixel_array, 0, 4095).astype(np.uint16)
+
+        def resize(reducing_gap):
+            ds = dataset_with_pixels.copy()
+            ds.Rows, ds.Columns = pixel_array.shape
+            ds.BitsStored = 12
+            ds.HighBit = 11
+            ds.PixelData = pixel_array.tobytes()
+            resized_ds = ImageResizer(thumbnail_size=400, reducing_gap=reducing_gap).resize(ds)
+            return np.frombuffer(resized_ds.PixelData, dtype=np.uint16).astype(np.int32)
+
+        baseline = resize(0)
+        reduced = resize(3.0)
+
+        difference = np.abs(reduced - baseline)
+        assert difference.any()  # the pre-reduction path actually ran
+        assert difference.mean() < 2
+        assert difference.max() <= 10
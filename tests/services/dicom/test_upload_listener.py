@@ -1,3 +1,4 @@
+import threading
 from unittest.mock import Mock
 
 import pytest
@@ -44,3 +45,35 @@ class TestUploadListener:
         listener.stop()
 
         assert listener._running is False
+
+    def test_start_fetches_next_batch_immediately_after_full_batch(self, mock_processor):
+        """A full batch is followed by the next batch without waiting for the poll interval."""
+        listener = UploadListener(processor=mock_processor, poll_interval=60, batch_size=10)
+
+        def full_then_stop(*args, **kwargs):
+            if mock_processor.process_batch.call_count == 2:
+                listener.stop()
+            return 10
+
+        mock_processor.process_batch.side_effect = full_then_stop
+
+        thread = threading.Thread(target=listener.start, daemon=True)
+        thread.start()
+        thread.join(timeout=1)
+
+        assert not thread.is_alive()
+        assert mock_processor.process_batch.call_count == 2
+
+    def test_stop_interrupts_poll_wait(self, mock_processor):
+        """Stopping the listener wakes it from the poll interval wait."""
+        polled = threading.Event()
+        mock_processor.process_batch.side_effect = lambda **_: polled.set() or 0
+        listener = UploadListener(processor=mock_processor, poll_interval=60)
+
+        thread = threading.Thread(target=listener.start, daemon=True)
+        thread.start()
+        polled.wait(timeout=1)
+        listener.stop()
+        thread.join(timeout=1)
+
+        assert not thread.is_alive()
@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 from unittest.mock import Mock, mock_open, patch
 
@@ -17,7 +18,9 @@ def mock_pacs_storage():
 @pytest.fixture
 def mock_mwl_storage():
     """Create mock MWL storage."""
-    return Mock()
+    storage = Mock()
+    storage.get_source_message_ids.return_value = {}
+    return storage
 
 
 @pytest.fixture
@@ -38,6 +41,24 @@ def processor(mock_pacs_storage, mock_mwl_storage, mock_uploader):
 
 
 class TestUploadProcessor:
+    def test_process_batch_uploads_instances_concurrently(self, mock_pacs_storage, mock_mwl_storage):
+        """Process batch runs uploads from the same batch at the same time."""
+        mock_pacs_storage.get_pending_uploads.return_value = [
+            {"sop_instance_uid": "1.2.3.1", "storage_path": "a/b/c.dcm", "upload_attempt_count": 0},
+            {"sop_instance_uid": "1.2.3.2", "storage_path": "d/e/f.dcm", "upload_attempt_count": 0},
+        ]
+        both_started = threading.Barrier(2, timeout=1)
+        uploader = Mock()
+        uploader.upload_dicom.side_effect = lambda *_: both_started.wait() is not None
+        subject = UploadProcessor(mock_pacs_storage, mock_mwl_storage, uploader, max_workers=2)
+
+        with patch.object(Path, "exists", return_value=True), patch("builtins.open", mock_open(read_data=b"")):
+            result = subject.process_batch(limit=10)
+        subject.close()
+
+        assert result == 2
+        assert mock_pacs_storage.mark_upload_complete.call_count == 2
+
     def test_process_batch_with_no_pending(self, processor, mock_pacs_storage):
         """Process batch with no pending."""
         mock_pacs_storage.get_pending_uploads.return_value = []
@@ -91,6 +112,54 @@ class TestUploadProcessor:
         mock_pacs_storage.mark_upload_started.assert_called_once_with("1.2.3.4")  # gitleaks:allow
         mock_pacs_storage.mark_upload_complete.assert_called_once_with("1.2.3.4")  # gitleaks:allow
         mock_uploader.upload_dicom.assert_called_once_with("1.2.3.4", mo(), "ACTION123")  # gitleaks:allow
+        mo().__exit__.assert_called_once()
+
+    def test_process_batch_scopes_action_ids_to_the_batch(
+        self, processor, mock_pacs_storage, mock_mwl_storage, mock_uploader
+    ):
+        """Action IDs are looked up afresh for each batch rather than kept on the processor."""
+        mock_pacs_storage.get_pending_uploads.return_value = [
+            {"sop_instance_uid": "1.2.3.1", "storage_path": "a/b/c.dcm", "accession_number": "ACC1"},
+        ]
+        mock_mwl_storage.get_source_message_ids.return_value = {"ACC1": "ACTION1"}
+        mock_uploader.upload_dicom.return_value = True
+
+        with patch.object(Path, "exists", return_value=True), patch("builtins.open", mock_open(read_data=b"")):
+            processor.process_batch()
+            processor.process_batch()
+
+        assert mock_mwl_storage.get_source_message_ids.call_count == 2
+
+    def test_process_batch_looks_up_action_ids_in_one_query(
+        self, processor, mock_pacs_storage, mock_mwl_storage, mock_uploader
+    ):
+        """Process batch resolves the action IDs for every accession number in the batch at once."""
+        mock_pacs_storage.get_pending_uploads.return_value = [
+            {"sop_instance_uid": "1.2.3.1", "storage_path": "a/b/c.dcm", "accession_number": "ACC1"},
+            {"sop_instance_uid": "1.2.3.2", "storage_path": "d/e/f.dcm", "accession_number": "ACC2"},
+            {"sop_instance_uid": "1.2.3.3", "storage_path": "g/h/i.dcm", "accession_number": "ACC1"},
+        ]
+        mock_mwl_storage.get_source_message_ids.return_value = {"ACC1": "ACTION1", "ACC2": "ACTION2"}
+        mock_uploader.upload_dicom.return_value = True
+
+        with patch.object(Path, "exists", return_value=True), patch("builtins.open", mock_open(read_data=b"")):
+            processor.process_batch(limit=10)
+
+        mock_mwl_storage.get_source_message_ids.assert_called_once_with(["ACC1", "ACC2", "ACC1"])
+        mock_mwl_storage.get_source_message_id.assert_not_called()
+        assert sorted(c.args[2] for c in mock_uploader.upload_dicom.call_args_list) == ["ACTION1", "ACTION1", "ACTION2"]
+
+    def test_upload_instance_looks_up_action_id_missing_from_batch(self, processor, mock_mwl_storage, mock_uploader):
+        """An action ID missing from the batch lookup is queried again, as the worklist item may arrive later."""
+        mock_mwl_storage.get_source_message_id.return_value = "ACTION123"
+        mock_uploader.upload_dicom.return_value = True
+        instance = {"sop_instance_uid": "1.2.3.1", "storage_path": "ab/cd/file.dcm", "accession_number": "ACC123"}
+
+        with patch.object(Path, "exists", return_value=True), patch("builtins.open", mock_open(read_data=b"")):
+            processor.upload_instance(instance, source_message_ids={"OTHER": "ACTION999"})
+
+        mock_mwl_storage.get_source_message_id.assert_called_once_with("ACC123")
+        assert mock_uploader.upload_dicom.call_args.args[2] == "ACTION123"
 
     def test_upload_instance_file_not_found(self, processor, mock_pacs_storage):
         """Upload processor: Upload instance file not found."""
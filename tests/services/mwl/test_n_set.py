@@ -53,6 +53,7 @@ class TestNSet:
         event.request.RequestedSOPInstanceUID = requested_sop_instance_uid
         event.attribute_list.PerformedProcedureStepStatus = "COMPLETED"
 
+        mock_storage.update_status_by_mpps_instance_uid.return_value = None
         mock_storage.get_worklist_item_by_mpps_instance_uid.return_value = None
 
         status, ds = NSet(mock_storage).call(event)
@@ -66,28 +67,21 @@ class TestNSet:
         event.request.RequestedSOPInstanceUID = requested_sop_instance_uid
         event.attribute_list.PerformedProcedureStepStatus = "COMPLETED"
 
-        worklist_item = MagicMock()
-        worklist_item.accession_number = "ACC123"
-        mock_storage.get_worklist_item_by_mpps_instance_uid.return_value = worklist_item
-
-        mock_storage.update_status.return_value = None
+        mock_storage.update_status_by_mpps_instance_uid.return_value = None
+        mock_storage.get_worklist_item_by_mpps_instance_uid.return_value = MagicMock()
 
         status, ds = NSet(mock_storage).call(event)
 
         assert status == PROCESSING_FAILURE
         assert ds is None
-        mock_storage.update_status.assert_called_once_with("ACC123", "COMPLETED")
+        mock_storage.update_status_by_mpps_instance_uid.assert_called_once_with(requested_sop_instance_uid, "COMPLETED")
 
     def test_successful_nset_returns_success_and_dataset(self, mock_storage, event, requested_sop_instance_uid):
         """Successful N-SET returns success and dataset."""
         event.request.RequestedSOPInstanceUID = requested_sop_instance_uid
         event.attribute_list.PerformedProcedureStepStatus = "COMPLETED"
 
-        worklist_item = MagicMock()
-        worklist_item.accession_number = "ACC123"
-        mock_storage.get_worklist_item_by_mpps_instance_uid.return_value = worklist_item
-
-        mock_storage.update_status.return_value = 1001  # mock message id
+        mock_storage.update_status_by_mpps_instance_uid.return_value = ("ACC123", 1001)  # mock message id
 
         status, ds = NSet(mock_storage).call(event)
 
@@ -97,14 +91,15 @@ class TestNSet:
         assert ds.SOPInstanceUID == requested_sop_instance_uid
         assert ds.PerformedProcedureStepStatus == "COMPLETED"
 
-        mock_storage.update_status.assert_called_once_with("ACC123", "COMPLETED")
+        mock_storage.update_status_by_mpps_instance_uid.assert_called_once_with(requested_sop_instance_uid, "COMPLETED")
+        mock_storage.get_worklist_item_by_mpps_instance_uid.assert_not_called()
 
     def test_exception_returns_processing_failure(self, mock_storage, event):
         """Exception returns processing failure."""
         event.request.RequestedSOPInstanceUID = generate_uid()
         event.attribute_list.PerformedProcedureStepStatus = "COMPLETED"
 
-        mock_storage.get_worklist_item_by_mpps_instance_uid.side_effect = Exception("DB error")
+        mock_storage.update_status_by_mpps_instance_uid.side_effect = Exception("DB error")
 
         status, ds = NSet(mock_storage).call(event)
 
@@ -1,6 +1,8 @@
 import hashlib
 import sqlite3
+import threading
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 from pydicom.uid import generate_uid
@@ -8,6 +10,7 @@ from pydicom.uid import generate_uid
 from models import WorklistItem
 from services.mwl import InvalidStatusTransitionError
 from services.storage import (
+    InstanceExistsError,
     MWLStorage,
     PACSStorage,
     WorklistItemExistsError,
@@ -26,6 +29,25 @@ def pacs_storage(db_file, tmp_dir):
     return storage
 
 
+@pytest.fixture
+def skip_first_existence_check(pacs_storage, monkeypatch):
+    """Make each thread's next existence check miss, as if a racing store had not committed yet."""
+
+    def skip():
+        instance_exists = pacs_storage.instance_exists
+        checked = threading.local()
+
+        def exists_after_first_check(sop_instance_uid):
+            if getattr(checked, "done", False):
+                return instance_exists(sop_instance_uid)
+            checked.done = True
+            return False
+
+        monkeypatch.setattr(pacs_storage, "instance_exists", exists_after_first_check)
+
+    return skip
+
+
 @pytest.fixture
 def mwl_storage(db_file):
     storage = MWLStorage(str(db_file))
@@ -61,6 +83,90 @@ class TestPACSStorage:
 
         assert table is not None
 
+    def test_init_adds_new_indexes_to_existing_database(self, pacs_storage, db_file, tmp_dir):
+        """Init adds indexes missing from a database created by an older schema."""
+        with pacs_storage._get_connection() as conn:
+            conn.execute("DROP INDEX idx_status_created_at")
+            conn.commit()
+
+        PACSStorage(str(db_file), str(tmp_dir))
+
+        conn = sqlite3.connect(db_file)
+        index = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_status_created_at'")
+        assert index.fetchone() is not None
+
+    def test_connection_pragmas(self, pacs_storage):
+        """Connections use WAL with relaxed sync and in-memory temp storage."""
+        with pacs_storage._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+    def test_connection_is_reused_within_a_thread(self, pacs_storage):
+        """Each thread reuses its own connection."""
+        with pacs_storage._get_connection() as first, pacs_storage._get_connection() as second:
+            assert first is second
+
+        connections = []
+
+        def other_thread():
+            with pacs_storage._get_connection() as conn:
+                connections.append(conn)
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+
+        assert connections[0] is not first
+
+    def test_uncommitted_transaction_is_rolled_back(self, pacs_storage):
+        """A transaction left open by an error is rolled back."""
+        with pytest.raises(RuntimeError):
+            with pacs_storage._get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO stored_instances (sop_instance_uid, storage_path, file_size, storage_hash) "
+                    "VALUES ('1.2.3', 'a/b.dcm', 1, 'hash')"
+                )
+                raise RuntimeError("boom")
+
+        assert pacs_storage.instance_exists("1.2.3") is False
+
+    def test_get_pending_uploads_uses_pending_index(self, pacs_storage):
+        """Pending uploads are read in created order straight from the pending index."""
+        statements = []
+        with pacs_storage._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            pacs_storage.get_pending_uploads(limit=10, max_retries=3)
+            conn.set_trace_callback(None)
+
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {statements[-1]}").fetchall()
+
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_upload_pending (upload_status=? AND status=?)" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_close_closes_connections(self, pacs_storage):
+        """Close closes open connections; later calls reconnect."""
+        with pacs_storage._get_connection() as conn:
+            pass
+
+        pacs_storage.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        assert pacs_storage.instance_exists("1.2.3") is False
+
+    def test_close_runs_optimize(self, pacs_storage):
+        """Close runs PRAGMA optimize before closing each connection."""
+        statements = []
+        with pacs_storage._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+
+        pacs_storage.close()
+
+        assert "PRAGMA optimize" in statements
+
     def test_instance_exists_returns_true(self, pacs_storage):
         """Instance exists returns true."""
         uid = generate_uid()
@@ -96,6 +202,115 @@ class TestPACSStorage:
 
         assert expected_rel in filepath
 
+    def test_store_file_skips_mkdir_for_existing_directory(self, pacs_storage, monkeypatch):
+        """Store file only creates hash directories that do not exist yet."""
+        pacs_storage.store_file("1.2.3", b"foo")
+        mkdir = Mock()
+        monkeypatch.setattr(Path, "mkdir", mkdir)
+
+        _, abs_path, _, _ = pacs_storage.store_file("1.2.3", b"bar")
+
+        mkdir.assert_not_called()
+        assert abs_path.read_bytes() == b"bar"
+        assert list(abs_path.parent.glob("*.tmp")) == []
+
+    def test_store_instance_raises_when_insert_conflicts(self, pacs_storage, skip_first_existence_check):
+        """Store instance raises InstanceExistsError when a concurrent store wins the insert."""
+        uid = generate_uid()
+        pacs_storage.store_instance(uid, b"foo", {})
+        skip_first_existence_check()
+
+        with pytest.raises(InstanceExistsError):
+            pacs_storage.store_instance(uid, b"bar", {})
+
+        stored_path = pacs_storage.storage_root / pacs_storage.get_instance(uid)["storage_path"]
+        assert stored_path.read_bytes() == b"foo"
+
+    @pytest.mark.parametrize("status", ["ARCHIVED", "DELETED"])
+    def test_store_instance_does_not_report_archived_or_deleted_as_existing(self, pacs_storage, status):
+        """Re-sending an archived or deleted instance fails rather than reporting it as already stored."""
+        uid = generate_uid()
+        pacs_storage.store_instance(uid, b"foo", {})
+        with pacs_storage._get_connection() as conn:
+            conn.execute("UPDATE stored_instances SET status = ? WHERE sop_instance_uid = ?", (status, uid))
+            conn.commit()
+
+        with pytest.raises(sqlite3.IntegrityError):
+            pacs_storage.store_instance(uid, b"bar", {})
+
+        stored_path = pacs_storage.storage_root / pacs_storage.get_instance(uid)["storage_path"]
+        assert stored_path.read_bytes() == b"foo"
+        assert list(stored_path.parent.glob("*.tmp")) == []
+
+    def test_store_instance_leaves_no_file_when_insert_fails(self, pacs_storage, db_file):
+        """A failed database write leaves neither a row nor a stored file behind."""
+        uid = generate_uid()
+        with pacs_storage._get_connection() as conn:
+            conn.execute("PRAGMA busy_timeout = 0")
+        blocker = sqlite3.connect(db_file)
+        blocker.execute("BEGIN IMMEDIATE")
+
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                pacs_storage.store_instance(uid, b"foo", {})
+        finally:
+            blocker.rollback()
+            blocker.close()
+
+        assert pacs_storage.get_instance(uid) is None
+        assert list(pacs_storage.storage_root.rglob("*.dcm")) == []
+        assert list(pacs_storage.storage_root.rglob("*.tmp")) == []
+
+    def test_store_instance_removes_row_when_file_cannot_be_moved(self, pacs_storage, monkeypatch):
+        """If the file cannot be moved into place, the committed row is removed again."""
+        uid = generate_uid()
+        monkeypatch.setattr("services.storage.os.replace", Mock(side_effect=PermissionError("in use")))
+
+        with pytest.raises(PermissionError):
+            pacs_storage.store_instance(uid, b"foo", {})
+
+        assert pacs_storage.get_instance(uid) is None
+        assert list(pacs_storage.storage_root.rglob("*.tmp")) == []
+
+    def test_concurrent_stores_keep_file_matching_recorded_hash(
+        self, pacs_storage, skip_first_existence_check, monkeypatch
+    ):
+        """Racing stores of one UID leave the winner's bytes on disk and no temporary files."""
+        uid = generate_uid()
+        skip_first_existence_check()
+        write_temp_file = pacs_storage._write_temp_file
+        both_written = threading.Barrier(2)
+
+        def write_temp_file_then_wait(*args):
+            result = write_temp_file(*args)
+            both_written.wait(timeout=5)
+            return result
+
+        monkeypatch.setattr(pacs_storage, "_write_temp_file", write_temp_file_then_wait)
+        outcomes = []
+
+        def store(data):
+            try:
+                pacs_storage.store_instance(uid, data, {})
+                outcomes.append("stored")
+            except InstanceExistsError:
+                outcomes.append("exists")
+
+        threads = [threading.Thread(target=store, args=(data,)) for data in (b"foo", b"bar")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(outcomes) == ["exists", "stored"]
+        with pacs_storage._get_connection() as conn:
+            row = conn.execute(
+                "SELECT storage_path, storage_hash FROM stored_instances WHERE sop_instance_uid = ?", (uid,)
+            ).fetchone()
+        stored_path = pacs_storage.storage_root / row["storage_path"]
+        assert hashlib.sha256(stored_path.read_bytes()).hexdigest() == row["storage_hash"]
+        assert list(stored_path.parent.glob("*.tmp")) == []
+
     def test_store_instance_saves_to_db(self, pacs_storage):
         """Store instance saves to db."""
         uid = generate_uid()
@@ -134,6 +349,20 @@ class TestMWLStorage:
 
         assert table is not None
 
+    def test_find_worklist_items_by_date_uses_scheduled_index(self, mwl_storage):
+        """Date range C-FIND queries are served from the scheduled index."""
+        statements = []
+        with mwl_storage._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            mwl_storage.find_worklist_items(modality="MG", scheduled_date="20240101-20240131")
+            conn.set_trace_callback(None)
+
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {statements[-1]}").fetchall()
+
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_worklist_scheduled" in details
+        assert "TEMP B-TREE" not in details
+
     def test_store_worklist_item(self, mwl_storage, result):
         """Store worklist item."""
         item = WorklistItem(**result)
@@ -157,6 +386,30 @@ class TestMWLStorage:
         with pytest.raises(WorklistItemExistsError):
             mwl_storage.store_worklist_item(item)
 
+    def test_store_worklist_items(self, mwl_storage, result):
+        """Store worklist items in a single batch."""
+        items = [
+            WorklistItem(**result),
+            WorklistItem(**{**result, "accession_number": "ACC654321", "source_message_id": "MSGID654321"}),
+        ]
+
+        assert mwl_storage.store_worklist_items(items) == 2
+
+        assert {item.accession_number for item in mwl_storage.find_worklist_items()} == {"ACC123456", "ACC654321"}
+
+    def test_store_worklist_items_already_exists_stores_nothing(self, mwl_storage, result):
+        """Store worklist items rolls back the whole batch when one already exists."""
+        self._insert_item(mwl_storage, result)
+        items = [
+            WorklistItem(**{**result, "accession_number": "ACC654321"}),
+            WorklistItem(**result),
+        ]
+
+        with pytest.raises(WorklistItemExistsError):
+            mwl_storage.store_worklist_items(items)
+
+        assert mwl_storage.get_worklist_item("ACC654321") is None
+
     def test_find_worklist_items(self, mwl_storage, result):
         """Find worklist items."""
         item = self._insert_item(mwl_storage, result)
@@ -288,6 +541,19 @@ class TestMWLStorage:
         """Get worklist item returns none."""
         assert mwl_storage.get_worklist_item("DOES_NOT_EXIST") is None
 
+    def test_get_source_message_ids(self, mwl_storage, result):
+        """MWL storage: Get source message IDs for several accession numbers in one query."""
+        mwl_storage.store_worklist_items([
+            WorklistItem(**result),
+            WorklistItem(**{**result, "accession_number": "ACC654321", "source_message_id": "MSGID654321"}),
+            WorklistItem(**{**result, "accession_number": "ACC000000", "source_message_id": None}),
+        ])
+
+        returned = mwl_storage.get_source_message_ids(["ACC123456", "ACC654321", "ACC000000", "MISSING", "ACC123456"])
+
+        assert returned == {"ACC123456": "MSGID123456", "ACC654321": "MSGID654321"}
+        assert mwl_storage.get_source_message_ids([]) == {}
+
     def test_update_status(self, mwl_storage, result):
         """MWL storage: Update status."""
         item = self._insert_item(mwl_storage, result)
@@ -330,6 +596,29 @@ class TestMWLStorage:
 
         assert mwl_storage.update_status(item.accession_number, "IN PROGRESS") is None
 
+    def test_update_status_by_mpps_instance_uid(self, mwl_storage, result):
+        """MWL storage: Update status by MPPS instance UID."""
+        item = self._insert_item(mwl_storage, result)
+        mwl_storage.update_status(item.accession_number, "IN PROGRESS", mpps_instance_uid="some-uid")
+
+        returned = mwl_storage.update_status_by_mpps_instance_uid("some-uid", "COMPLETED")
+
+        assert returned == (item.accession_number, item.source_message_id)
+        assert mwl_storage.get_worklist_item(item.accession_number).status == "COMPLETED"
+
+    def test_update_status_by_mpps_instance_uid_returns_none_when_not_found(self, mwl_storage):
+        """MWL storage: Update status by MPPS instance UID returns none when not found."""
+        assert mwl_storage.update_status_by_mpps_instance_uid("nope", "COMPLETED") is None
+        assert mwl_storage.update_status_by_mpps_instance_uid(None, "COMPLETED") is None
+
+    def test_update_status_by_mpps_instance_uid_returns_none_on_wrong_state(self, mwl_storage, result):
+        """MWL storage: Update status by MPPS instance UID returns none on wrong state."""
+        item = self._insert_item(mwl_storage, result)
+        mwl_storage.update_status(item.accession_number, "IN PROGRESS", mpps_instance_uid="some-uid")
+        mwl_storage.update_status_by_mpps_instance_uid("some-uid", "COMPLETED")
+
+        assert mwl_storage.update_status_by_mpps_instance_uid("some-uid", "DISCONTINUED") is None
+
     def test_update_study_instance_uid(self, mwl_storage, result):
         """MWL storage: Update study instance UID."""
         item = self._insert_item(mwl_storage, result)
@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import config
+
+
+class TestLoadEnvFile:
+    def test_loads_dotenv_by_default(self, monkeypatch):
+        """Load env file: loads .env by default."""
+        monkeypatch.delenv("LOAD_DOTENV", raising=False)
+
+        with patch("dotenv.load_dotenv") as mock_load_dotenv:
+            config.load_env_file()
+
+        mock_load_dotenv.assert_called_once_with()
+
+    def test_skips_dotenv_when_disabled(self, monkeypatch):
+        """Load env file: skips .env when LOAD_DOTENV=0."""
+        monkeypatch.setenv("LOAD_DOTENV", "0")
+
+        with patch("dotenv.load_dotenv") as mock_load_dotenv:
+            config.load_env_file()
+
+        mock_load_dotenv.assert_not_called()
+
+
+class TestSqliteMmapSize:
+    def test_defaults_to_256_mib(self, monkeypatch):
+        """SQLite mmap size: defaults to 256 MiB."""
+        monkeypatch.delenv("SQLITE_MMAP_SIZE", raising=False)
+
+        assert config.sqlite_mmap_size() == 256 * 1024 * 1024
+
+    def test_reads_value_at_call_time(self, monkeypatch):
+        """SQLite mmap size: reads SQLITE_MMAP_SIZE when called; 0 disables it."""
+        monkeypatch.setenv("SQLITE_MMAP_SIZE", "0")
+
+        assert config.sqlite_mmap_size() == 0
+
+    def test_invalid_value_falls_back_to_default(self, monkeypatch):
+        """SQLite mmap size: a non-numeric or negative value falls back to the default."""
+        for value in ("lots", "-1"):
+            monkeypatch.setenv("SQLITE_MMAP_SIZE", value)
+
+            assert config.sqlite_mmap_size() == config.DEFAULT_SQLITE_MMAP_SIZE
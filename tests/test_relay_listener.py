@@ -1,5 +1,6 @@
 import asyncio
 import json
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -56,6 +57,7 @@ class TestRelayListener:
                     websocket,
                     refresh_at=9999999999,
                 )
+            await subject._accepts.join()
 
         mock_connect.assert_called_once_with(
             "wss://accept-url",
@@ -102,6 +104,7 @@ class TestRelayListener:
                     websocket,
                     refresh_at=9999999999,
                 )
+            await subject._accepts.join()
 
         client_ws.send.assert_called_once_with(json.dumps({"status": "created", "action_id": "action-12345"}))
         storage_instance.store_worklist_item.assert_called_once_with(
@@ -141,6 +144,17 @@ class TestRelayListener:
             )
         )
 
+    def test_process_action_reuses_action_handlers(self, storage_instance, listener_payload):
+        """Action handlers are built once, not per message."""
+        with patch("relay_listener.CreateWorklistItem") as mock_create:
+            subject = RelayListener(storage_instance)
+
+            subject.process_action(listener_payload)
+            subject.process_action(listener_payload)
+
+        mock_create.assert_called_once_with(storage_instance)
+        assert mock_create.return_value.call.call_count == 2
+
     def test_process_update_item_status_action(self, storage_instance, listener_payload):
         """Process update item status action."""
         subject = RelayListener(storage_instance)
@@ -230,6 +244,54 @@ class TestRelayListener:
 
         storage_instance.store_worklist_item.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_listen_on_connection_serves_accepts_concurrently(self, storage_instance):
+        """Accepted connections are served concurrently, not one after another."""
+        subject = RelayListener(storage_instance)
+        websocket = AsyncMock()
+        websocket.recv.side_effect = [
+            json.dumps({"accept": {"address": "wss://first"}}),
+            json.dumps({"accept": {"address": "wss://second"}}),
+            RelayTokenExpiredError("Azure Relay token expired"),
+        ]
+        both_started = asyncio.Barrier(2)
+        served = []
+
+        async def handle_accept(accept_url):
+            # Only passes if both accepts are being handled at the same time
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            served.append(accept_url)
+
+        with patch.object(subject, "_handle_accept", side_effect=handle_accept):
+            with pytest.raises(RelayTokenExpiredError):
+                await subject._listen_on_connection(websocket, refresh_at=9999999999)
+            await subject._accepts.join()
+
+        assert sorted(served) == ["wss://first", "wss://second"]
+
+    @pytest.mark.asyncio
+    async def test_handle_accept_processes_action_off_the_event_loop(self, storage_instance, listener_payload):
+        """Actions are processed in a worker thread so SQLite writes do not block the event loop."""
+        subject = RelayListener(storage_instance)
+        client_ws = AsyncMock()
+        client_ws.recv.return_value = json.dumps(listener_payload)
+        connection_cm = AsyncMock()
+        connection_cm.__aenter__.return_value = client_ws
+        threads = []
+
+        def process_action(payload):
+            threads.append(threading.current_thread())
+            return {"status": "created"}
+
+        with (
+            patch("relay_listener.connect", return_value=connection_cm),
+            patch.object(subject, "process_action", side_effect=process_action),
+        ):
+            await subject._handle_accept("wss://accept")
+
+        assert threads and threads[0] is not threading.current_thread()
+        client_ws.send.assert_awaited_once_with(json.dumps({"status": "created"}))
+
     @pytest.mark.asyncio
     async def test_listen_refreshes_connection_after_timeout(
         self,
@@ -269,6 +331,41 @@ class TestRelayListener:
         mock_connect.assert_any_call("wss://first-url")
         mock_connect.assert_any_call("wss://second-url")
 
+    @pytest.mark.asyncio
+    async def test_listen_stops_accept_workers_when_the_connection_fails(self, storage_instance):
+        """When listen() exits, queued accepts are dropped and the accept workers are cancelled and awaited."""
+        subject = RelayListener(storage_instance)
+        connection_cm = AsyncMock()
+        connection_cm.__aenter__.return_value = AsyncMock()
+        in_flight = asyncio.Event()
+        workers = []
+
+        async def handle_accept(accept_url):
+            in_flight.set()
+            await asyncio.Event().wait()
+
+        async def listen_on_connection(websocket, refresh_at):
+            subject._start_accept_workers()
+            workers.extend(subject._accept_workers)
+            await subject._accepts.put("wss://in-flight")
+            await in_flight.wait()
+            await subject._accepts.put("wss://queued")
+            raise ConnectionClosedError(None, None)
+
+        with (
+            patch.object(subject.relay_uri, "connection_details", return_value=("wss://url", 9999999999)),
+            patch.object(subject, "_connect", return_value=connection_cm),
+            patch.object(subject, "_listen_on_connection", side_effect=listen_on_connection),
+            patch.object(subject, "_handle_accept", side_effect=handle_accept),
+            pytest.raises(ConnectionClosedError),
+        ):
+            await subject.listen()
+
+        assert workers and all(worker.done() for worker in workers)
+        assert subject._accept_workers == []
+        assert subject._accepts.empty()
+        await asyncio.wait_for(subject._accepts.join(), timeout=1)
+
 
 class TestRelayURIWithDefaultAzureCredential:
     """Non-production, no SAS key — uses DefaultAzureCredential."""
@@ -329,6 +426,34 @@ class TestRelayURIWithSasToken:
         assert "sb-hc-token=SharedAccessSignature" in url
         assert isinstance(expires_on, int)
 
+    def test_sas_token_is_reused_until_refresh_margin(self):
+        """SAS token is reused across reconnects until it is due for refresh."""
+        subject = RelayURI()
+
+        with patch("relay_listener.time.time", return_value=1_000_000):
+            first = subject.connection_details()
+            second = subject.connection_details()
+
+        assert second == first
+
+        with patch("relay_listener.time.time", return_value=first[1] - 300):
+            refreshed = subject.connection_details()
+
+        assert refreshed[1] > first[1]
+        assert refreshed[0] != first[0]
+
+    def test_sas_token_with_other_expiry_bypasses_cache(self):
+        """A SAS token requested with a non-default lifetime is not served from the cache."""
+        subject = RelayURI()
+
+        with patch("relay_listener.time.time", return_value=1_000_000):
+            default = subject.connection_details()
+            _, short_expiry = subject._create_sas_token(expiry_seconds=60)
+            cached = subject.connection_details()
+
+        assert short_expiry == 1_000_060
+        assert cached == default
+
     def test_no_credential_is_created(self):
         """No credential is created."""
         with patch("relay_listener.DefaultAzureCredential") as mock_dac:
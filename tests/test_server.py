@@ -57,6 +57,8 @@ class TestPACSServer:
         assert subject.ae == mock_ae.return_value
 
         mock_ae.assert_called_once_with(ae_title="SCREENING_PACS")
+        assert mock_ae.return_value.maximum_pdu_size == 0
+        assert mock_ae.return_value.acse_timeout == 60
         add_context_calls = [call.args[0] for call in mock_ae.return_value.add_supported_context.call_args_list]
         assert Verification in add_context_calls
         assert DigitalMammographyXRayImageStorageForPresentation in add_context_calls
@@ -79,6 +81,7 @@ class TestPACSServer:
 
         cast(Mock, subject.ae).shutdown.assert_called_once()
         cast(Mock, subject.storage).close.assert_called_once()
+        cast(Mock, subject.mwl_storage).close.assert_called_once()
 
 
 @patch(f"{MWLServer.__module__}.MWLStorage")
@@ -120,6 +123,8 @@ class TestMWLServer:
         assert subject.ae == mock_ae_instance
 
         mock_ae.assert_called_once_with(ae_title="MWL_SCP")
+        assert mock_ae.return_value.maximum_pdu_size == 0
+        assert mock_ae.return_value.acse_timeout == 60
         mock_ae_instance.add_supported_context.assert_any_call(Verification)
         mock_ae_instance.add_supported_context.assert_any_call(
             ModalityWorklistInformationFind,
@@ -143,3 +148,4 @@ class TestMWLServer:
         subject.stop()
 
         cast(Mock, subject.ae).shutdown.assert_called_once()
+        cast(Mock, subject.storage).close.assert_called_once()
@@ -0,0 +1,42 @@
+import logging
+from logging.handlers import QueueHandler
+from unittest.mock import patch
+
+from telemetry import configure_logging
+
+
+class TestConfigureLogging:
+    def test_root_logger_writes_through_queue(self, monkeypatch):
+        """Configure logging: log records are queued for a background listener."""
+        monkeypatch.setenv("LOG_LEVEL", "debug")
+
+        with (
+            patch("telemetry.QueueListener") as mock_listener,
+            patch("telemetry.logging.basicConfig") as mock_basic_config,
+        ):
+            configure_logging()
+
+        mock_listener.return_value.start.assert_called_once()
+        handlers = mock_basic_config.call_args.kwargs["handlers"]
+        assert len(handlers) == 1
+        assert isinstance(handlers[0], QueueHandler)
+        assert handlers[0].queue is mock_listener.call_args.args[0]
+        assert mock_basic_config.call_args.kwargs["level"] == "DEBUG"
+
+    def test_log_format_is_applied_once_by_the_listener(self, monkeypatch):
+        """Configure logging: queued records reach the output handler formatted with LOG_FORMAT exactly once."""
+        monkeypatch.setenv("LOG_FORMAT", "[%(levelname)s] %(message)s")
+
+        with (
+            patch("telemetry.QueueListener") as mock_listener,
+            patch("telemetry.logging.basicConfig") as mock_basic_config,
+        ):
+            configure_logging()
+
+        queue_handler = mock_basic_config.call_args.kwargs["handlers"][0]
+        output_handler = mock_listener.call_args.args[1]
+        record = logging.LogRecord("test", logging.WARNING, __file__, 1, "stored %s", ("1.2.3",), None)
+
+        queued = queue_handler.prepare(record)
+
+        assert output_handler.format(queued) == "[WARNING] stored 1.2.3"